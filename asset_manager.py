@@ -1,36 +1,307 @@
 
 import pygame
 import os
+import io
+import json
+import mmap
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from settings import *
 
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+ATLAS_FORMAT_VERSION = 1
+
+def image_key(rel_path):
+    """Asset key for a path relative to SPRITES_DIR.
+
+    e.g., Ships/spaceShips_001.png -> ships_spaceships_001_png
+    """
+    return rel_path.replace(os.sep, '_').replace('/', '_').replace('.', '_').lower()
+
+def source_stamp(path):
+    """(size, mtime) of a source image, used to detect a stale atlas cache"""
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+def read_image(path):
+    """Decode an image file to (RGBA bytes, size); safe to run off the main thread"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    image = pygame.image.load(io.BytesIO(data), path)
+    return pygame.image.tobytes(image, 'RGBA'), image.get_size()
+
 class AssetManager:
     def __init__(self):
         self.images = {}
+        self.manifest = {}  # key -> {'path': absolute path, 'size': (w, h) or None}
         self.sounds = {}
-        self.fonts = {}
+        self.fonts = {}  # (family, size, bold) -> Font
+        
+        # LRU cache of rendered text surfaces
+        self.text_cache = OrderedDict()
+        
+        # LRU cache of scaled/rotated/flipped images shared by all sprites
+        self.transform_cache = OrderedDict()
+        self.transform_cache_bytes = 0
+        self.transform_cache_limit = TRANSFORM_CACHE_BYTES
+        self.transform_hits = 0
+        self.transform_misses = 0
+        
+        # Collision masks, one per transformed variant; small enough to keep
+        self.mask_cache = {}
+
+        # Transformed surface -> (name, size, angle, flip) it was made from
+        self.transform_sources = weakref.WeakKeyDictionary()
+
+        # Background decoding started by start_loading
+        self.loader = None
+        self.pending = {}  # key -> Future of read_image
+        self.load_total = 0
 
     def load_images(self, directory=SPRITES_DIR):
         """Recursively loads all images from the specified directory."""
         for root, _, files in os.walk(directory):
             for file in files:
-                if file.lower().endswith(('.png', '.jpg', '.jpeg')):
+                if file.lower().endswith(IMAGE_EXTENSIONS):
                     file_path = os.path.join(root, file)
-                    # Create a key based on the relative path from SPRITES_DIR, without extension
-                    # e.g., Sprites/Ships/spaceShips_001.png -> ships_spaceships_001
-                    rel_path = os.path.relpath(file_path, directory)
-                    key = rel_path.replace(os.sep, '_').replace('.', '_').lower()
+                    # Create a key based on the relative path from SPRITES_DIR
+                    key = image_key(os.path.relpath(file_path, directory))
                     
-                    try:
-                        image = pygame.image.load(file_path).convert_alpha()
+                    image = self._decode(file_path)
+                    if image:
                         self.images[key] = image
-                    except pygame.error as e:
-                        print(f"Failed to load image: {file_path}. Error: {e}")
+
+    def load_manifest(self, path=MANIFEST_PATH, directory=SPRITES_DIR):
+        """Index images without decoding them; get_image decodes on first access.
+
+        Reads the manifest written by get_dimensions.py, or scans
+        ``directory`` for file names if there is no manifest.
+        """
+        self.manifest = {}
+        try:
+            with open(path) as f:
+                entries = json.load(f)['images']
+        except (OSError, ValueError, KeyError) as e:
+            print(f"No usable asset manifest ({e}), scanning {directory}")
+            for root, _, files in os.walk(directory):
+                for file in files:
+                    if file.lower().endswith(IMAGE_EXTENSIONS):
+                        file_path = os.path.join(root, file)
+                        key = image_key(os.path.relpath(file_path, directory))
+                        self.manifest[key] = {'path': file_path, 'size': None}
+            return
+
+        for entry in entries:
+            self.manifest[entry['key']] = {
+                'path': os.path.join(BASE_DIR, *entry['path'].split('/')),
+                'size': (entry['width'], entry['height']),
+            }
+
+    def load_atlas(self, index_path=ATLAS_INDEX_PATH, blob_path=ATLAS_BLOB_PATH):
+        """Load images from the atlas cache written by build_atlas.py.
+
+        The raw RGBA blob is memory-mapped and each atlas becomes a surface
+        via pygame.image.frombuffer, so no PNG is decoded. Returns False,
+        leaving the normal loading path in charge, if the cache is missing
+        or any source image changed since it was built.
+        """
+        try:
+            with open(index_path) as f:
+                index = json.load(f)
+            if index.get('version') != ATLAS_FORMAT_VERSION:
+                return False
+            for rel_path, size, mtime in index['sources'].values():
+                if source_stamp(os.path.join(BASE_DIR, *rel_path.split('/'))) != (size, mtime):
+                    print(f"Atlas cache is stale ({rel_path} changed), loading images directly")
+                    return False
+            blob_file = open(blob_path, 'rb')
+        except (OSError, ValueError, KeyError):
+            return False
+
+        with blob_file, mmap.mmap(blob_file.fileno(), 0, access=mmap.ACCESS_READ) as blob:
+            view = memoryview(blob)
+            atlases = []
+            for atlas in index['atlases']:
+                w, h, offset = atlas['width'], atlas['height'], atlas['offset']
+                pixels = view[offset:offset + w * h * 4]
+                # convert_alpha copies into display format, so the mapping can be closed after
+                atlases.append(pygame.image.frombuffer(pixels, (w, h), 'RGBA').convert_alpha())
+                pixels.release()
+            view.release()
+
+        for key, (atlas, x, y, w, h) in index['images'].items():
+            self.images[key] = atlases[atlas].subsurface((x, y, w, h))
+            self.manifest.pop(key, None)
+        return True
+
+    def start_loading(self, keys, workers=ASSET_LOAD_WORKERS):
+        """Decode the listed images that are not loaded yet on a thread pool
+
+        Worker threads only read and decode files into raw RGBA buffers;
+        ``poll_loading`` turns finished ones into display-format surfaces on
+        the calling thread. ``get_image`` on a key still in flight waits for
+        that one image.
+        """
+        keys = [key for key in keys if key in self.manifest and key not in self.pending]
+        if not keys:
+            return
+        if self.loader is None:
+            self.loader = ThreadPoolExecutor(workers or os.cpu_count() or 1, thread_name_prefix='asset-loader')
+        for key in keys:
+            self.pending[key] = self.loader.submit(read_image, self.manifest[key]['path'])
+        self.load_total += len(keys)
+
+    def poll_loading(self, budget_ms=None):
+        """Convert decoded images until ``budget_ms`` runs out; True once nothing is pending"""
+        deadline = None if budget_ms is None else time.perf_counter() + budget_ms / 1000
+        for key, future in list(self.pending.items()):
+            if not future.done():
+                continue
+            self._finish_loading(key)
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+        if self.pending:
+            return False
+        if self.loader is not None:
+            self.loader.shutdown(wait=False)
+            self.loader = None
+        return True
+
+    def loading_progress(self):
+        """Fraction of the images handed to start_loading that are ready"""
+        if not self.load_total:
+            return 1.0
+        return 1 - len(self.pending) / self.load_total
+
+    def _finish_loading(self, key):
+        future = self.pending.pop(key)
+        path = self.manifest.pop(key)['path']
+        try:
+            data, size = future.result()
+        except (pygame.error, OSError) as e:
+            print(f"Failed to load image: {path}. Error: {e}")
+            return None
+        image = self.images[key] = pygame.image.frombuffer(data, size, 'RGBA').convert_alpha()
+        return image
+
+    def _decode(self, file_path):
+        try:
+            return pygame.image.load(file_path).convert_alpha()
+        except (pygame.error, FileNotFoundError) as e:
+            print(f"Failed to load image: {file_path}. Error: {e}")
+            return None
 
     def get_image(self, name):
-        return self.images.get(name)
+        image = self.images.get(name)
+        if image is None and name in self.pending:
+            image = self._finish_loading(name)
+        elif image is None and name in self.manifest:
+            image = self._decode(self.manifest.pop(name)['path'])
+            if image:
+                self.images[name] = image
+        return image
+
+    def get_image_size(self, name):
+        """Dimensions of an image without decoding it, or None if unknown"""
+        if name in self.images:
+            return self.images[name].get_size()
+        entry = self.manifest.get(name)
+        return entry['size'] if entry else None
+
+    def preload(self, keys):
+        """Decode a set of images up front, e.g. before a screen needs them"""
+        for key in keys:
+            self.get_image(key)
 
     def scale_image(self, name, size):
         if name in self.images:
             self.images[name] = pygame.transform.scale(self.images[name], size)
 
+    def get_transformed(self, name, size=None, angle=0, flip=(False, False)):
+        """Return a shared scaled, rotated and/or flipped copy of an image.
+
+        Transforms are applied as scale, then rotate, then flip. Results are
+        memoized in a bounded LRU cache, so callers must not draw onto the
+        returned surface.
+        """
+        key = (name, tuple(size) if size else None, angle % 360, tuple(flip))
+        image = self.transform_cache.get(key)
+        if image is not None:
+            self.transform_cache.move_to_end(key)
+            self.transform_hits += 1
+            return image
+
+        image = self.get_image(name)
+        if image is None:
+            return None
+
+        self.transform_misses += 1
+        if size:
+            image = pygame.transform.scale(image, size)
+        if key[2]:
+            image = pygame.transform.rotate(image, key[2])
+        if any(flip):
+            image = pygame.transform.flip(image, *flip)
+
+        self.transform_cache[key] = image
+        self.transform_sources[image] = key
+        self.transform_cache_bytes += image.get_pitch() * image.get_height()
+        while self.transform_cache_bytes > self.transform_cache_limit and len(self.transform_cache) > 1:
+            _, evicted = self.transform_cache.popitem(last=False)
+            self.transform_cache_bytes -= evicted.get_pitch() * evicted.get_height()
+        return image
+
+    def transform_source(self, image):
+        """``(name, size, angle, flip)`` that ``get_transformed`` built ``image`` from, or None"""
+        return self.transform_sources.get(image)
+
+    def get_mask(self, name, size=None, angle=0, flip=(False, False)):
+        """Collision mask of ``get_transformed(name, size, angle, flip)``, built once per variant"""
+        key = (name, tuple(size) if size else None, angle % 360, tuple(flip))
+        mask = self.mask_cache.get(key)
+        if mask is None:
+            image = self.get_transformed(name, size, angle, flip)
+            if image is None:
+                return None
+            mask = self.mask_cache[key] = pygame.mask.from_surface(image)
+        return mask
+
+    def get_font(self, size, bold=False, family='arial'):
+        """Shared font for a family/size/bold combination, created once"""
+        key = (family, size, bold)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.SysFont(family, size, bold=bold)
+            self.fonts[key] = font
+        return font
+
+    def render_text(self, font, text, color, antialias=True):
+        """Rendered text surface, re-rendered only when font, text or color change.
+
+        The surface is shared with other callers and must not be modified.
+        """
+        key = (font, text, tuple(color), antialias)
+        surf = self.text_cache.get(key)
+        if surf is not None:
+            self.text_cache.move_to_end(key)
+            return surf
+
+        surf = font.render(text, antialias, color)
+        self.text_cache[key] = surf
+        if len(self.text_cache) > TEXT_CACHE_SIZE:
+            self.text_cache.popitem(last=False)
+        return surf
+
+    def transform_cache_info(self):
+        """Size and hit statistics of the transform cache"""
+        return {
+            'entries': len(self.transform_cache),
+            'bytes': self.transform_cache_bytes,
+            'limit': self.transform_cache_limit,
+            'hits': self.transform_hits,
+            'misses': self.transform_misses,
+        }
+
 asset_manager = AssetManager()
@@ -0,0 +1,136 @@
+import os
+import json
+import pygame
+from settings import *
+from asset_manager import source_stamp
+
+class AudioManager:
+    """Sound effects from pre-decoded PCM on a fixed pool of mixer channels
+
+    Each sound is decoded once and its raw samples are cached in
+    AUDIO_CACHE_DIR for the current mixer format, so later runs skip the
+    MP3 decoder. ``play`` goes through a pool of reserved channels and
+    drops requests that exceed a sound's voice cap or come sooner than its
+    retrigger interval after the last one. When no mixer is available all
+    calls are no-ops.
+    """
+    def __init__(self):
+        self.sounds = {}  # name -> Sound
+        self.limits = {}  # name -> (max voices, retrigger ms)
+        self.last_played = {}  # name -> ticks
+        self.channels = []
+        self.started = {}  # Channel -> ticks when its current voice started
+        self.played = 0
+        self.dropped = 0
+        self.stolen = 0
+
+    def init(self, frequency=AUDIO_FREQUENCY, buffer=AUDIO_BUFFER, channels=AUDIO_MIXER_CHANNELS):
+        """Open the mixer with a small buffer; call before ``pygame.init``"""
+        pygame.mixer.pre_init(frequency, -16, 2, buffer)
+        try:
+            pygame.mixer.init()
+        except pygame.error as e:
+            print(f"Audio unavailable: {e}")
+            return False
+        pygame.mixer.set_num_channels(channels)
+        self._reserve_channels()
+        return True
+
+    def _reserve_channels(self, count=AUDIO_RESERVED_CHANNELS):
+        """Keep the first ``count`` channels for this manager's voices"""
+        if self.channels or not pygame.mixer.get_init():
+            return
+        count = min(count, pygame.mixer.get_num_channels())
+        pygame.mixer.set_reserved(count)
+        self.channels = [pygame.mixer.Channel(i) for i in range(count)]
+
+    def _cache_paths(self, name):
+        frequency, size, channels = pygame.mixer.get_init()
+        base = os.path.join(AUDIO_CACHE_DIR, f"{name}_{frequency}_{size}_{channels}")
+        return base + '.pcm', base + '.json'
+
+    def _decode(self, name, path):
+        """Sound for ``path``, from the PCM cache when it matches the source"""
+        pcm_path, meta_path = self._cache_paths(name)
+        stamp = list(source_stamp(path))
+        try:
+            with open(meta_path) as f:
+                fresh = json.load(f).get('source') == stamp
+            if fresh:
+                with open(pcm_path, 'rb') as f:
+                    return pygame.mixer.Sound(buffer=f.read())
+        except (OSError, ValueError):
+            pass
+
+        sound = pygame.mixer.Sound(path)
+        # Several processes may fill the cache at once (balance.py workers):
+        # write under private names and swap each file in whole, samples
+        # first, so a fresh .json never points at a partial .pcm
+        suffix = f".{os.getpid()}.tmp"
+        try:
+            os.makedirs(AUDIO_CACHE_DIR, exist_ok=True)
+            with open(pcm_path + suffix, 'wb') as f:
+                f.write(sound.get_raw())
+            with open(meta_path + suffix, 'w') as f:
+                json.dump({'source': stamp}, f)
+            os.replace(pcm_path + suffix, pcm_path)
+            os.replace(meta_path + suffix, meta_path)
+        except OSError as e:
+            print(f"Could not cache decoded {name}: {e}")
+        return sound
+
+    def load(self, name, path, max_voices=SOUND_VOICE_LIMIT, retrigger_ms=SOUND_RETRIGGER_MS, volume=1.0):
+        """Decode and register a sound under ``name``"""
+        if name in self.sounds or not pygame.mixer.get_init():
+            return self.sounds.get(name)
+        try:
+            sound = self._decode(name, path)
+        except (pygame.error, FileNotFoundError) as e:
+            print(f"Failed to load sound {name}: {e}")
+            return None
+        sound.set_volume(volume)
+        self._reserve_channels()
+        self.sounds[name] = sound
+        self.limits[name] = (max_voices, retrigger_ms)
+        return sound
+
+    def play(self, name):
+        """Play a registered sound unless its voice cap or retrigger interval says not to"""
+        sound = self.sounds.get(name)
+        if sound is None or not self.channels:
+            return None
+
+        now = pygame.time.get_ticks()
+        max_voices, retrigger_ms = self.limits[name]
+        if now - self.last_played.get(name, -retrigger_ms) < retrigger_ms:
+            self.dropped += 1
+            return None
+
+        free = None
+        voices = 0
+        for channel in self.channels:
+            if channel.get_busy():
+                if channel.get_sound() is sound:
+                    voices += 1
+            elif free is None:
+                free = channel
+        if voices >= max_voices:
+            self.dropped += 1
+            return None
+
+        if free is None:
+            # Every reserved channel is busy: cut off the oldest voice
+            free = min(self.channels, key=lambda channel: self.started.get(channel, 0))
+            self.stolen += 1
+
+        free.play(sound)
+        self.started[free] = now
+        self.last_played[name] = now
+        self.played += 1
+        return free
+
+    def stop_all(self):
+        for channel in self.channels:
+            channel.stop()
+
+audio_manager = AudioManager()
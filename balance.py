@@ -0,0 +1,257 @@
+import os
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import argparse
+import importlib
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pygame
+from settings import *
+from game_clock import game_clock
+from game_random import game_random
+from replay import KeyState
+
+DODGE_DISTANCE = 160  # How far above the player a threat makes the bot sidestep
+AIM_TOLERANCE = 12  # Horizontal offset at which the bot considers a target lined up
+
+class BotPolicy:
+    """Decides which keys are held on each simulation tick
+
+    ``reset`` is called with the GameManager at the start of every session;
+    ``keys`` is then installed as the player's key source.
+    """
+    name = 'idle'
+
+    def reset(self, game_manager):
+        self.game_manager = game_manager
+
+    def keys(self):
+        return KeyState()
+
+class AimBot(BotPolicy):
+    """Sidesteps anything falling towards the ship, otherwise lines up under
+    the lowest obstacle and fires once it is in line"""
+    name = 'aim'
+
+    def keys(self):
+        gm = self.game_manager
+        player = gm.player.rect
+        held = []
+
+        threat = None
+        for sprite in (*gm.obstacle_sprites, *gm.enemy_bullets):
+            rect = sprite.rect
+            if (player.top - DODGE_DISTANCE < rect.bottom < player.bottom
+                    and rect.right > player.left - 10 and rect.left < player.right + 10):
+                if threat is None or rect.bottom > threat.bottom:
+                    threat = rect
+
+        if threat is not None:
+            go_left = threat.centerx > player.centerx
+            if go_left and player.left <= 0 or not go_left and player.right >= SCREEN_WIDTH:
+                go_left = not go_left
+            held.append(pygame.K_LEFT if go_left else pygame.K_RIGHT)
+            return KeyState.from_keys(held)
+
+        target = None
+        for sprite in gm.obstacle_sprites:
+            rect = sprite.rect
+            if rect.bottom > 0 and rect.bottom < player.top and (target is None or rect.bottom > target.bottom):
+                target = rect
+
+        if target is not None:
+            offset = target.centerx - player.centerx
+            if offset < -AIM_TOLERANCE:
+                held.append(pygame.K_LEFT)
+            elif offset > AIM_TOLERANCE:
+                held.append(pygame.K_RIGHT)
+            else:
+                held.append(pygame.K_SPACE)
+        return KeyState.from_keys(held)
+
+POLICIES = {policy.name: policy for policy in [BotPolicy, AimBot]}
+
+def load_policy(name):
+    """Policy class by registry name or ``module:Class`` path"""
+    if name in POLICIES:
+        return POLICIES[name]
+    module, _, attr = name.partition(':')
+    if not attr:
+        raise ValueError(f"unknown policy {name!r}; use one of {', '.join(POLICIES)} or module:Class")
+    return getattr(importlib.import_module(module), attr)
+
+# Each worker process keeps one runner and reuses it for all its sessions
+_runner = None
+
+def _get_runner():
+    global _runner
+    if _runner is None:
+        from headless import HeadlessRunner
+        _runner = HeadlessRunner()
+    return _runner
+
+def run_session(job):
+    """Play one story session with a bot and report how it went
+
+    ``job`` is ``(story_id, policy name, seed, max_seconds)`` so it can be
+    sent to a worker process.
+    """
+    story_id, policy_name, seed, max_seconds = job
+    runner = _get_runner()
+    gm = runner.game_manager
+    story = gm.story_mode.stories[story_id]
+
+    # Same seed, same session, whatever the worker ran before
+    game_clock.use_virtual()
+    game_random.seed(seed)
+    policy = load_policy(policy_name)()
+    runner.start('story', story_id)
+    policy.reset(gm)
+    gm.player.key_source = policy.keys
+
+    max_ticks = int(max_seconds * 1000 / runner.tick_ms)
+    wave_index = gm.story_mode.current_wave_index
+    wave_start = runner.ticks
+    wave_times = []
+    start_ticks = runner.ticks
+
+    while gm.game_state == 'playing' and runner.ticks - start_ticks < max_ticks:
+        runner.step()
+        if gm.story_mode.current_wave_index != wave_index:
+            wave_times.append((runner.ticks - wave_start) * runner.tick_ms / 1000)
+            wave_index = gm.story_mode.current_wave_index
+            wave_start = runner.ticks
+
+    player = gm.player
+    if gm.game_state == 'story_complete':
+        outcome = 'complete'
+    elif gm.game_state == 'playing':
+        outcome = 'timeout'
+    elif player.health <= 0:
+        outcome = 'death'
+    elif player.bullets_remaining == 0:
+        outcome = 'out_of_ammo'
+    else:
+        outcome = 'time_limit'
+
+    budget = next((c.value for c in story.challenges if c.type == 'limited_bullets'), None)
+    return {
+        'story_id': story_id,
+        'seed': seed,
+        'outcome': outcome,
+        'final_wave': min(wave_index, len(story.waves) - 1),
+        'wave_times': wave_times,
+        'bullets_fired': player.bullets_fired,
+        'bullet_budget': budget,
+        'score': player.score,
+        'sim_seconds': (runner.ticks - start_ticks) * runner.tick_ms / 1000,
+    }
+
+def aggregate(sessions, stories):
+    """Per-story completion, wave timing, ammo and death statistics"""
+    report = {}
+    for story_id in sorted({s['story_id'] for s in sessions}):
+        runs = [s for s in sessions if s['story_id'] == story_id]
+        story = stories[story_id]
+        waves = []
+        for index in range(len(story.waves)):
+            reached = [s for s in runs if s['final_wave'] >= index]
+            times = [s['wave_times'][index] for s in runs if len(s['wave_times']) > index]
+            deaths = sum(1 for s in runs if s['final_wave'] == index and s['outcome'] == 'death')
+            waves.append({
+                'wave': index + 1,
+                'reached': len(reached),
+                'cleared': len(times),
+                'mean_seconds': round(float(np.mean(times)), 2) if times else None,
+                'p95_seconds': round(float(np.percentile(times, 95)), 2) if times else None,
+                'deaths': deaths,
+                'death_rate': round(deaths / len(reached), 4) if reached else 0.0,
+            })
+
+        fired = np.array([s['bullets_fired'] for s in runs])
+        budget = runs[0]['bullet_budget']
+        outcomes = {}
+        for s in runs:
+            outcomes[s['outcome']] = outcomes.get(s['outcome'], 0) + 1
+        report[story_id] = {
+            'title': story.title,
+            'sessions': len(runs),
+            'completion_rate': round(outcomes.get('complete', 0) / len(runs), 4),
+            'outcomes': outcomes,
+            'ammo': {
+                'budget': budget,
+                'mean_used': round(float(fired.mean()), 2),
+                'p95_used': round(float(np.percentile(fired, 95)), 2),
+                'mean_budget_used': round(float(fired.mean()) / budget, 4) if budget else None,
+            },
+            'mean_score': round(float(np.mean([s['score'] for s in runs])), 1),
+            'waves': waves,
+        }
+    return report
+
+def format_table(report):
+    lines = []
+    for story_id, story in report.items():
+        ammo = story['ammo']
+        outcomes = ', '.join(f"{name} {count}" for name, count in sorted(story['outcomes'].items()))
+        lines.append(f"Story {story_id}: {story['title']}  ({story['sessions']} sessions)")
+        lines.append(f"  completion {story['completion_rate']:.1%}   outcomes: {outcomes}")
+        budget = f"{ammo['budget']}" if ammo['budget'] else "unlimited"
+        lines.append(f"  ammo used  mean {ammo['mean_used']:.1f}  p95 {ammo['p95_used']:.1f}  of {budget}")
+        lines.append(f"  {'wave':>6} {'reached':>8} {'cleared':>8} {'mean s':>8} {'p95 s':>8} {'deaths':>7} {'death %':>8}")
+        for wave in story['waves']:
+            mean = f"{wave['mean_seconds']:.1f}" if wave['mean_seconds'] is not None else '-'
+            p95 = f"{wave['p95_seconds']:.1f}" if wave['p95_seconds'] is not None else '-'
+            lines.append(f"  {wave['wave']:>6} {wave['reached']:>8} {wave['cleared']:>8} {mean:>8} {p95:>8} "
+                         f"{wave['deaths']:>7} {wave['death_rate']:>8.1%}")
+        lines.append("")
+    return "\n".join(lines)
+
+def simulate(story_ids, runs, policy='aim', workers=None, seed=0, max_seconds=600):
+    """Run ``runs`` sessions of each story across worker processes"""
+    load_policy(policy)  # Fail early on a bad name
+    jobs = [(story_id, policy, seed + i, max_seconds) for story_id in story_ids for i in range(runs)]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return [run_session(job) for job in jobs]
+    # Large chunks keep the per-job IPC cost negligible next to a session
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(workers) as executor:
+        return list(executor.map(run_session, jobs, chunksize=chunksize))
+
+def main():
+    from story_mode import StoryMode
+
+    stories = StoryMode().stories
+    parser = argparse.ArgumentParser(description="Balance story configurations with headless bot sessions")
+    parser.add_argument('--story', type=int, action='append', choices=sorted(stories),
+                        help="story id (repeatable; default: all)")
+    parser.add_argument('--runs', type=int, default=100, help="sessions per story")
+    parser.add_argument('--policy', default='aim', help=f"bot policy: {', '.join(POLICIES)} or module:Class")
+    parser.add_argument('--workers', type=int, help="worker processes (default: CPU count)")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the first session")
+    parser.add_argument('--max-seconds', type=float, default=600, help="game-time cap per session")
+    parser.add_argument('--json', action='store_true', help="print JSON instead of a table")
+    args = parser.parse_args()
+    try:
+        load_policy(args.policy)
+    except (ValueError, ImportError, AttributeError) as e:
+        parser.error(str(e))
+
+    start = time.perf_counter()
+    sessions = simulate(args.story or sorted(stories), args.runs, args.policy, args.workers,
+                        args.seed, args.max_seconds)
+    report = aggregate(sessions, stories)
+    wall = time.perf_counter() - start
+
+    if args.json:
+        print(json.dumps({'policy': args.policy, 'wall_seconds': round(wall, 2), 'stories': report}, indent=2))
+    else:
+        print(format_table(report))
+        print(f"{len(sessions)} sessions with policy '{args.policy}' in {wall:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""Headless frame benchmarks for Space Shooter.
+
+Run ``python -m benchmarks`` from the repository root. Each scenario drives
+the real game objects on the SDL dummy drivers and a virtual clock, and the
+results (per-phase mean/p95/p99 in milliseconds plus entity counts) are
+written as JSON so runs from different commits can be compared.
+"""
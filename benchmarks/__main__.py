@@ -0,0 +1,74 @@
+import argparse
+import json
+import sys
+import headless  # noqa: F401  Selects the SDL dummy drivers before pygame starts
+from benchmarks.harness import run_scenario, environment
+from benchmarks.scenarios import SCENARIOS
+
+def compare(baseline, results):
+    """Print per-phase mean deltas against a previous results file"""
+    for name, result in results['scenarios'].items():
+        base = baseline.get('scenarios', {}).get(name)
+        if not base:
+            continue
+        print(f"{name}:", file=sys.stderr)
+        rows = [('frame', base['frame'], result['frame'])]
+        rows += [(phase, base['phases'][phase], stats)
+                 for phase, stats in result['phases'].items() if phase in base['phases']]
+        for phase, old, new in rows:
+            change = (new['mean_ms'] - old['mean_ms']) / old['mean_ms'] * 100 if old['mean_ms'] else 0.0
+            print(f"  {phase:<16} {old['mean_ms']:>9.3f} -> {new['mean_ms']:>9.3f} ms ({change:+.1f}%)",
+                  file=sys.stderr)
+
+def run_all(names, args, renderer):
+    results = {'environment': environment(), 'scenarios': {}}
+    for name in names:
+        results['scenarios'][name] = run_scenario(SCENARIOS[name](), args.frames, args.warmup, args.seed, renderer)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description="Run headless frame benchmarks")
+    parser.add_argument('scenarios', nargs='*', metavar='SCENARIO',
+                        help=f"scenarios to run (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument('--frames', type=int, default=600, help="measured frames per scenario")
+    parser.add_argument('--warmup', type=int, default=60, help="unmeasured frames before timing")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', '-o', help="write JSON here instead of stdout")
+    parser.add_argument('--baseline', help="previous JSON results to compare against")
+    parser.add_argument('--renderer', choices=('software', 'sdl2'), default='software',
+                        help="draw with surface blits or through the SDL2 Renderer backend")
+    parser.add_argument('--compare-renderers', action='store_true',
+                        help="also run with the other renderer and compare (default: sprite-heavy scenarios)")
+    args = parser.parse_args()
+    for name in args.scenarios:
+        if name not in SCENARIOS:
+            parser.error(f"unknown scenario {name!r}")
+
+    if args.scenarios:
+        names = args.scenarios
+    elif args.compare_renderers:
+        names = [name for name, scenario in SCENARIOS.items() if scenario.sprite_heavy]
+    else:
+        names = list(SCENARIOS)
+    results = run_all(names, args, args.renderer)
+    other = None
+    if args.compare_renderers:
+        other = 'sdl2' if args.renderer == 'software' else 'software'
+        results['other_renderer'] = run_all(names, args, other)['scenarios']
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(json.load(f), results)
+    if other:
+        print(f"Renderer {args.renderer} -> {other}:", file=sys.stderr)
+        compare(results, {'scenarios': results['other_renderer']})
+
+if __name__ == "__main__":
+    main()
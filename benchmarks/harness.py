@@ -0,0 +1,135 @@
+import platform
+import random
+import subprocess
+import time
+import numpy as np
+import pygame
+from headless import HeadlessRunner
+from settings import *
+from game_clock import game_clock
+from game_random import game_random
+from presenter import create_presenter
+
+DT = SIM_DT
+
+class Scenario:
+    """A scripted workload measured frame by frame
+
+    Subclasses set up game state in ``setup`` and return the ordered list of
+    ``(phase name, callable)`` pairs that make up one frame from ``phases``.
+    """
+    name = ''
+    description = ''
+    sprite_heavy = False  # Included by default when comparing renderers
+    presenter = None  # Set when the frame goes through a Presenter backend
+
+    def setup(self, runner):
+        self.runner = runner
+        self.game_manager = runner.game_manager
+        self.screen = runner.game_manager.display_surface
+
+    def phases(self):
+        raise NotImplementedError
+
+    def entity_counts(self):
+        gm = self.game_manager
+        return {
+            'visible_sprites': len(gm.visible_sprites),
+            'entities': len(gm.entities),
+            'obstacle_sprites': len(gm.obstacle_sprites),
+            'player_bullets': len(gm.player_bullets),
+            'enemy_bullets': len(gm.enemy_bullets),
+            'particles': len(gm.ui.particle_system),
+        }
+
+    # Common phases shared by the scenarios
+    def events(self):
+        game_clock.advance(self.runner.tick_ms)
+        if self.game_manager.game_active:
+            self.game_manager.scheduler.advance(self.runner.tick_ms)
+
+    def ui_update(self):
+        self.game_manager.ui.update(DT, self.game_manager.game_state)
+
+    def draw(self):
+        self.screen.fill(UI_BG_DARK)
+        self.game_manager.draw()
+
+    def present(self):
+        if self.presenter:
+            self.presenter.present()
+        else:
+            pygame.display.flip()
+
+def summarize(samples):
+    """Mean/p95/p99/max of a list of seconds, reported in milliseconds"""
+    ms = np.asarray(samples) * 1000
+    return {
+        'mean_ms': round(float(ms.mean()), 4),
+        'p95_ms': round(float(np.percentile(ms, 95)), 4),
+        'p99_ms': round(float(np.percentile(ms, 99)), 4),
+        'max_ms': round(float(ms.max()), 4),
+    }
+
+def run_scenario(scenario, frames=600, warmup=60, seed=0, renderer='software'):
+    """Run one scenario and return its result dict
+
+    With ``renderer='software'`` the game draws straight onto the display
+    surface as before; other backends draw and present through
+    ``presenter.create_presenter``.
+    """
+    random.seed(seed)  # Scenario scripting
+    game_random.seed(seed)
+    presenter = None
+    if renderer != 'software':
+        pygame.init()
+        presenter = create_presenter(renderer)
+    runner = HeadlessRunner(surface=presenter.surface if presenter else None)
+    if presenter:
+        runner.game_manager.sprite_layer = presenter.sprite_layer
+        scenario.presenter = presenter
+    scenario.setup(runner)
+
+    phases = scenario.phases()
+    timings = {name: [] for name, _ in phases}
+    frame_times = []
+    peak = {}
+    perf_counter = time.perf_counter
+
+    for frame in range(warmup + frames):
+        frame_start = perf_counter()
+        for name, phase in phases:
+            start = perf_counter()
+            phase()
+            if frame >= warmup:
+                timings[name].append(perf_counter() - start)
+        if frame >= warmup:
+            frame_times.append(perf_counter() - frame_start)
+            for key, count in scenario.entity_counts().items():
+                peak[key] = max(peak.get(key, 0), count)
+
+    if presenter:
+        presenter.close()
+    return {
+        'description': scenario.description,
+        'renderer': presenter.backend if presenter else 'software',
+        'frames': frames,
+        'frame': summarize(frame_times),
+        'phases': {name: summarize(samples) for name, samples in timings.items()},
+        'entities': {'final': scenario.entity_counts(), 'peak': peak},
+    }
+
+def environment():
+    """Metadata that identifies where and on what code a run happened"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+    }
@@ -0,0 +1,136 @@
+import random
+from settings import *
+from benchmarks.harness import Scenario, DT
+
+class IdleMenu(Scenario):
+    name = 'idle_menu'
+    description = "Main menu with the star field (UI.show_menu)"
+
+    def setup(self, runner):
+        super().setup(runner)
+        self.game_manager.game_state = 'menu'
+
+    def phases(self):
+        return [('ui_update', self.ui_update), ('draw', self.draw), ('present', self.present)]
+
+class GameplayScenario(Scenario):
+    """Base for scenarios that run the gameplay loop"""
+    def sprites_update(self):
+        self.game_manager.all_sprites.update()
+        self.game_manager.entities.update()
+
+    def collisions(self):
+        self.game_manager.check_collisions()
+
+    def phases(self):
+        return [
+            ('events', self.events),
+            ('ui_update', self.ui_update),
+            ('sprites_update', self.sprites_update),
+            ('collisions', self.collisions),
+            ('draw', self.draw),
+            ('present', self.present),
+        ]
+
+class MeteorBulletSpam(GameplayScenario):
+    name = 'meteors_200_bullet_spam'
+    sprite_heavy = True
+    description = "200 live meteors while bullets are fired every frame"
+    meteor_count = 200
+    bullets_per_frame = 4
+
+    def setup(self, runner):
+        super().setup(runner)
+        gm = self.game_manager
+        gm.start_game('endless')
+        # Keep the player out of harm's way so the session never ends
+        gm.player.invincible = True
+        gm.player.invincible_duration = float('inf')
+        self.top_up()
+
+    def top_up(self):
+        gm = self.game_manager
+        while len(gm.obstacle_sprites) < self.meteor_count:
+            gm.create_meteor()
+            meteor = gm.obstacle_sprites.sprites()[-1]
+            meteor.place(y=random.randint(-50, SCREEN_HEIGHT // 2))
+
+    def spawn(self):
+        gm = self.game_manager
+        self.top_up()
+        for _ in range(self.bullets_per_frame):
+            gm.create_player_bullet(random.randint(0, SCREEN_WIDTH), SCREEN_HEIGHT - 60)
+
+    def phases(self):
+        return [('spawn', self.spawn)] + super().phases()
+
+class ExplosionStorm(Scenario):
+    name = 'explosion_storm'
+    description = "ParticleSystem.emit_explosion bursts every frame over the star field"
+    explosions_per_frame = 10
+
+    def setup(self, runner):
+        super().setup(runner)
+        self.particle_system = self.game_manager.ui.particle_system
+
+    def emit(self):
+        for _ in range(self.explosions_per_frame):
+            self.particle_system.emit_explosion(
+                random.randint(0, SCREEN_WIDTH),
+                random.randint(0, SCREEN_HEIGHT),
+                PARTICLE_COUNT_EXPLOSION,
+                (255, 150, 50)
+            )
+
+    def particles_update(self):
+        self.particle_system.update(DT)
+
+    def particles_draw(self):
+        self.screen.fill(UI_BG_DARK)
+        self.particle_system.draw(self.screen)
+
+    def phases(self):
+        return [
+            ('emit', self.emit),
+            ('particles_update', self.particles_update),
+            ('particles_draw', self.particles_draw),
+            ('present', self.present),
+        ]
+
+class FleetInvasionWave4(GameplayScenario):
+    name = 'story2_wave4'
+    sprite_heavy = True
+    description = "Story 'THE FLEET INVASION', wave 4 with all enemy types"
+    story_id = 2
+    wave_index = 3
+
+    def setup(self, runner):
+        super().setup(runner)
+        gm = self.game_manager
+        runner.start('story', self.story_id)
+        gm.story_mode.current_wave_index = self.wave_index
+        gm.start_wave()
+        gm.player.invincible = True
+        gm.player.invincible_duration = float('inf')
+        gm.player.bullets_remaining = -1
+
+class GameOverOverlay(Scenario):
+    name = 'game_over'
+    description = "Game-over overlay over the final game state"
+
+    def setup(self, runner):
+        super().setup(runner)
+        gm = self.game_manager
+        gm.start_game('endless')
+        gm.game_over()
+
+    def phases(self):
+        return [('ui_update', self.ui_update), ('draw', self.draw), ('present', self.present)]
+
+SCENARIOS = {scenario.name: scenario for scenario in [
+    IdleMenu,
+    MeteorBulletSpam,
+    ExplosionStorm,
+    FleetInvasionWave4,
+    GameOverOverlay,
+]}
@@ -0,0 +1,84 @@
+import os
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import json
+import numpy as np
+import pygame
+from settings import *
+from asset_manager import IMAGE_EXTENSIONS, ATLAS_FORMAT_VERSION, image_key, source_stamp
+
+PADDING = 1  # Transparent gap between packed images
+
+def collect_images(directory=SPRITES_DIR):
+    """(key, path, RGBA pixel array) for every sprite, tallest first"""
+    images = []
+    for root, _, files in os.walk(directory):
+        for file in files:
+            if file.lower().endswith(IMAGE_EXTENSIONS):
+                path = os.path.join(root, file)
+                surface = pygame.image.load(path)
+                w, h = surface.get_size()
+                pixels = np.frombuffer(pygame.image.tobytes(surface, 'RGBA'), dtype=np.uint8).reshape(h, w, 4)
+                images.append((image_key(os.path.relpath(path, directory)), path, pixels))
+    images.sort(key=lambda item: (-item[2].shape[0], item[0]))
+    return images
+
+def pack(images, size=ATLAS_SIZE):
+    """Shelf-pack images into atlases; returns (atlas sizes, {key: (atlas, x, y, w, h)})"""
+    atlases = []
+    placements = {}
+    x = y = shelf_height = 0
+
+    for key, _, pixels in images:
+        h, w = pixels.shape[:2]
+        if w > size or h > size:
+            raise ValueError(f"{key} ({w}x{h}) does not fit in a {size}px atlas")
+        if not atlases or x + w > size:
+            # Start a new shelf, or a new atlas when the shelf would not fit
+            y += shelf_height + (PADDING if atlases else 0)
+            x = shelf_height = 0
+            if not atlases or y + h > size:
+                atlases.append([size, 0])
+                y = 0
+        placements[key] = (len(atlases) - 1, x, y, w, h)
+        atlases[-1][1] = max(atlases[-1][1], y + h)
+        x += w + PADDING
+        shelf_height = max(shelf_height, h)
+
+    return [tuple(atlas) for atlas in atlases], placements
+
+def build_atlas(directory=SPRITES_DIR, blob_path=ATLAS_BLOB_PATH, index_path=ATLAS_INDEX_PATH, size=ATLAS_SIZE):
+    """Pack every sprite into raw RGBA atlases plus a JSON index"""
+    images = collect_images(directory)
+    atlas_sizes, placements = pack(images, size)
+
+    pages = [np.zeros((h, w, 4), dtype=np.uint8) for w, h in atlas_sizes]
+    index = {
+        'version': ATLAS_FORMAT_VERSION,
+        'atlases': [],
+        'images': {},
+        'sources': {},
+    }
+    for key, path, pixels in images:
+        atlas, x, y, w, h = placements[key]
+        pages[atlas][y:y + h, x:x + w] = pixels
+        index['images'][key] = [atlas, x, y, w, h]
+        index['sources'][key] = [os.path.relpath(path, BASE_DIR).replace(os.sep, '/'), *source_stamp(path)]
+
+    os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+    offset = 0
+    with open(blob_path, 'wb') as f:
+        for page in pages:
+            h, w = page.shape[:2]
+            index['atlases'].append({'offset': offset, 'width': w, 'height': h})
+            f.write(page.tobytes())
+            offset += page.nbytes
+
+    with open(index_path, 'w') as f:
+        json.dump(index, f)
+
+    print(f"Packed {len(images)} images into {len(pages)} atlas(es), {offset / 1e6:.1f} MB -> {blob_path}")
+
+if __name__ == "__main__":
+    build_atlas()
@@ -0,0 +1,95 @@
+import numpy as np
+import pygame
+from settings import *
+
+class DirtyRectTracker:
+    """Collects the screen regions that changed this frame
+
+    The whole frame is still composited every tick; only presenting it is
+    narrowed to ``display.update(rects)``. Drawing code reports regions whose
+    content may differ from the previous frame (moving sprites, animated
+    text, particles). Each region is presented on the frame it is reported
+    and the frame after, so whatever was there gets erased. Static
+    elements need no reporting, but anything that appears or disappears
+    all at once (screen changes, full-screen flashes) must call
+    ``invalidate`` to force full flips.
+    """
+    def __init__(self):
+        self.enabled = DIRTY_RECTS
+        self.rects = []
+        self.previous = []
+        self.full_frames = 1
+        shape = (-(-SCREEN_HEIGHT // DIRTY_TILE_SIZE), -(-SCREEN_WIDTH // DIRTY_TILE_SIZE))
+        self.tiles = np.zeros(shape, dtype=bool)
+        self.previous_tiles = np.zeros(shape, dtype=bool)
+
+    def add(self, rect):
+        if self.enabled:
+            self.rects.append(rect)
+
+    def extend(self, rects):
+        if self.enabled:
+            self.rects.extend(rects)
+
+    def add_tiles(self, x, y, size):
+        """Report many small boxes (arrays of left and top, plus a common max size) as coarse tiles
+
+        Each box marks the DIRTY_TILE_SIZE tiles it touches. At present time
+        this frame's tiles and the previous frame's are merged into one rect
+        per horizontal run, so hundreds of particles cost a few dozen regions.
+        """
+        if not self.enabled or len(x) == 0:
+            return
+        tile = DIRTY_TILE_SIZE
+        rows, cols = self.tiles.shape
+        x = np.asarray(x)
+        y = np.asarray(y)
+        for tx in (x // tile, (x + size) // tile):
+            for ty in (y // tile, (y + size) // tile):
+                inside = (tx >= 0) & (tx < cols) & (ty >= 0) & (ty < rows)
+                self.tiles[ty[inside], tx[inside]] = True
+
+    def _tile_rects(self):
+        """Rects covering the tiles marked this frame or the last one"""
+        grid = self.tiles | self.previous_tiles
+        self.previous_tiles, self.tiles = self.tiles, self.previous_tiles
+        self.tiles[:] = False
+        tile = DIRTY_TILE_SIZE
+        rects = []
+        for row in np.flatnonzero(grid.any(axis=1)).tolist():
+            # The padding column ensures every run has an end
+            edges = np.flatnonzero(np.diff(grid[row].astype(np.int8), prepend=0, append=0))
+            for start, end in edges.reshape(-1, 2).tolist():
+                rects.append(pygame.Rect(start * tile, row * tile, (end - start) * tile, tile))
+        return rects
+
+    def invalidate(self):
+        """Present the whole screen this frame and the next"""
+        self.full_frames = 2
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.invalidate()
+
+    def take(self):
+        """Regions to present this frame, or None for the whole screen"""
+        if not self.enabled:
+            return None
+
+        rects = self.rects + self.previous + self._tile_rects()
+        self.previous = self.rects
+        self.rects = []
+
+        if self.full_frames > 0 or len(rects) > DIRTY_RECT_LIMIT:
+            self.full_frames = max(0, self.full_frames - 1)
+            return None
+        return rects
+
+    def present(self):
+        rects = self.take()
+        if rects is None:
+            pygame.display.flip()
+        elif rects:
+            pygame.display.update(rects)
+
+dirty_rects = DirtyRectTracker()
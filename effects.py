@@ -1,8 +1,39 @@
 
 import pygame
-import random
 import math
+import numpy as np
+from collections import OrderedDict
 from settings import *
+from profiler import profiler
+from dirty_rects import dirty_rects
+from asset_manager import asset_manager
+from game_random import np_rng
+
+# Star tint palette used by ParticleSystem.emit_star_field
+STAR_COLORS = np.array([
+    (255, 255, 255),
+    (200, 200, 255),
+    (255, 255, 200),
+], dtype=np.uint8)
+
+# Pre-rendered particle circles keyed by (diameter, color, quantized alpha)
+_stamp_cache = {}
+_ALPHA_STEP = 256 // PARTICLE_ALPHA_LEVELS
+
+def get_particle_stamp(size, color, alpha):
+    """Return the cached circle surface for a particle, or None if it is invisible"""
+    diameter = int(size * 2)
+    radius = diameter // 2
+    if radius <= 0 or alpha <= 0:
+        return None
+    alpha = min(255, int(alpha) // _ALPHA_STEP * _ALPHA_STEP + _ALPHA_STEP - 1)
+    key = (diameter, tuple(color[:3]), alpha)
+    stamp = _stamp_cache.get(key)
+    if stamp is None:
+        stamp = pygame.Surface((diameter, diameter), pygame.SRCALPHA)
+        pygame.draw.circle(stamp, (*key[1], alpha), (radius, radius), radius)
+        _stamp_cache[key] = stamp
+    return stamp
 
 class Particle:
     """Individual particle for particle systems"""
@@ -27,67 +58,170 @@ class Particle:
     
     def draw(self, surface):
         if self.alpha > 0:
-            color_with_alpha = (*self.color[:3], self.alpha)
-            # Create a surface with per-pixel alpha
-            particle_surf = pygame.Surface((int(self.size * 2), int(self.size * 2)), pygame.SRCALPHA)
-            pygame.draw.circle(particle_surf, color_with_alpha, (int(self.size), int(self.size)), int(self.size))
-            surface.blit(particle_surf, (int(self.x - self.size), int(self.y - self.size)))
+            stamp = get_particle_stamp(self.size, self.color, self.alpha)
+            if stamp:
+                surface.blit(stamp, (int(self.x - self.size), int(self.y - self.size)))
 
 class ParticleSystem:
-    """Manages multiple particles for various effects"""
-    def __init__(self):
-        self.particles = []
+    """Manages multiple particles for various effects
+
+    Particles live in preallocated NumPy arrays (structure of arrays) so the
+    whole system is integrated with a handful of vectorized operations per
+    frame. Live particles are always packed into the first ``count`` slots;
+    dead ones are compacted away during ``update``.
+    """
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.count = 0
+        self.rng = np_rng
+        self._allocate(capacity)
+    
+    def _allocate(self, capacity):
+        """(Re)allocate the particle arrays, keeping live particles"""
+        old = getattr(self, 'pos', None)
+        pos = np.zeros((capacity, 2), dtype=np.float64)
+        vel = np.zeros((capacity, 2), dtype=np.float64)
+        age = np.zeros(capacity, dtype=np.float64)
+        lifetime = np.zeros(capacity, dtype=np.float64)
+        color = np.zeros((capacity, 3), dtype=np.uint8)
+        size = np.zeros(capacity, dtype=np.float64)
+        if old is not None and self.count:
+            n = self.count
+            pos[:n] = self.pos[:n]
+            vel[:n] = self.vel[:n]
+            age[:n] = self.age[:n]
+            lifetime[:n] = self.lifetime[:n]
+            color[:n] = self.color[:n]
+            size[:n] = self.size[:n]
+        self.pos, self.vel, self.age = pos, vel, age
+        self.lifetime, self.color, self.size = lifetime, color, size
+        self.capacity = capacity
+    
+    def _reserve(self, n):
+        """Return the slice of ``n`` free slots, growing the arrays if needed"""
+        needed = self.count + n
+        if needed > self.capacity:
+            capacity = self.capacity
+            while capacity < needed:
+                capacity *= 2
+            self._allocate(capacity)
+        start = self.count
+        self.count = needed
+        return slice(start, needed)
+    
+    def __len__(self):
+        return self.count
+    
+    @property
+    def alpha(self):
+        """Per-particle alpha (0-255) of the live particles"""
+        n = self.count
+        alpha = 255 * (1 - self.age[:n] / self.lifetime[:n])
+        return alpha.astype(np.int32)
     
     def emit_star_field(self, width, height, count=100):
         """Create a starfield background"""
-        for _ in range(count):
-            x = random.randint(0, width)
-            y = random.randint(0, height)
-            vx = 0
-            vy = random.uniform(0.5, 2.0)
-            color = random.choice([
-                (255, 255, 255),
-                (200, 200, 255),
-                (255, 255, 200),
-            ])
-            size = random.uniform(0.5, 2.0)
-            lifetime = float('inf')  # Stars don't die
-            self.particles.append(Particle(x, y, vx, vy, color, size, lifetime))
+        rng = self.rng
+        s = self._reserve(count)
+        self.pos[s, 0] = rng.integers(0, width, count, endpoint=True)
+        self.pos[s, 1] = rng.integers(0, height, count, endpoint=True)
+        self.vel[s, 0] = 0
+        self.vel[s, 1] = rng.uniform(0.5, 2.0, count)
+        self.color[s] = STAR_COLORS[rng.integers(0, len(STAR_COLORS), count)]
+        self.size[s] = rng.uniform(0.5, 2.0, count)
+        self.age[s] = 0
+        self.lifetime[s] = np.inf  # Stars don't die
     
     def emit_explosion(self, x, y, count=20, color=(255, 100, 0)):
         """Create an explosion effect"""
-        for _ in range(count):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(50, 150)
-            vx = math.cos(angle) * speed
-            vy = math.sin(angle) * speed
-            size = random.uniform(2, 5)
-            lifetime = random.uniform(0.3, 0.8)
-            self.particles.append(Particle(x, y, vx, vy, color, size, lifetime))
+        rng = self.rng
+        s = self._reserve(count)
+        angle = rng.uniform(0, 2 * math.pi, count)
+        speed = rng.uniform(50, 150, count)
+        self.pos[s] = (x, y)
+        self.vel[s, 0] = np.cos(angle) * speed
+        self.vel[s, 1] = np.sin(angle) * speed
+        self.color[s] = color[:3]
+        self.size[s] = rng.uniform(2, 5, count)
+        self.age[s] = 0
+        self.lifetime[s] = rng.uniform(0.3, 0.8, count)
     
     def emit_trail(self, x, y, color=(100, 200, 255)):
         """Create a trail effect for bullets or ships"""
-        vx = random.uniform(-20, 20)
-        vy = random.uniform(-20, 20)
-        size = random.uniform(1, 3)
-        lifetime = random.uniform(0.2, 0.5)
-        self.particles.append(Particle(x, y, vx, vy, color, size, lifetime))
+        rng = self.rng
+        s = self._reserve(1)
+        self.pos[s] = (x, y)
+        self.vel[s] = rng.uniform(-20, 20, 2)
+        self.color[s] = color[:3]
+        self.size[s] = rng.uniform(1, 3)
+        self.age[s] = 0
+        self.lifetime[s] = rng.uniform(0.2, 0.5)
     
     def update(self, dt):
         """Update all particles and remove dead ones"""
-        self.particles = [p for p in self.particles if p.update(dt)]
+        with profiler.span('particles_update'):
+            self._update(dt)
+    
+    def _update(self, dt):
+        n = self.count
+        if n == 0:
+            return
+        
+        self.pos[:n] += self.vel[:n] * dt
+        self.age[:n] += dt
+        
+        # Compact live particles to the front of the arrays
+        alive = self.age[:n] < self.lifetime[:n]
+        if not alive.all():
+            live = np.flatnonzero(alive)
+            m = len(live)
+            for arr in (self.pos, self.vel, self.age, self.lifetime, self.color, self.size):
+                arr[:m] = arr[live]
+            self.count = n = m
         
         # Wrap stars around screen
-        for p in self.particles:
-            if p.lifetime == float('inf'):  # Stars
-                if p.y > SCREEN_HEIGHT:
-                    p.y = 0
-                    p.x = random.randint(0, SCREEN_WIDTH)
+        wrap = np.isinf(self.lifetime[:n]) & (self.pos[:n, 1] > SCREEN_HEIGHT)
+        wrapped = np.count_nonzero(wrap)
+        if wrapped:
+            self.pos[:n, 1][wrap] = 0
+            self.pos[:n, 0][wrap] = self.rng.integers(0, SCREEN_WIDTH, wrapped, endpoint=True)
     
     def draw(self, surface):
-        """Draw all particles"""
-        for particle in self.particles:
-            particle.draw(surface)
+        """Draw all particles with a single batched blit"""
+        with profiler.span('particles_draw'):
+            self._draw(surface)
+    
+    def _visible(self):
+        """Size, color, alpha and integer top-left of the particles worth drawing"""
+        n = self.count
+        size = self.size[:n]
+        alpha = self.alpha
+        visible = (alpha > 0) & (size >= 1)
+        size = size[visible]
+        topleft = (self.pos[:n][visible] - size[:, None]).astype(np.int32)
+        return size, self.color[:n][visible], alpha[visible], topleft
+    
+    def blit_list(self):
+        """``(stamp, (x, y))`` of every visible particle"""
+        if self.count == 0:
+            return []
+        size, color, alpha, topleft = self._visible()
+        return self._blits(size, color, alpha, topleft)
+    
+    def _blits(self, size, color, alpha, topleft):
+        get_stamp = get_particle_stamp
+        return [(get_stamp(s, c, a), pos)
+                for s, c, a, pos in zip(size.tolist(), map(tuple, color.tolist()),
+                                        alpha.tolist(), topleft.tolist())]
+    
+    def _draw(self, surface):
+        if self.count == 0:
+            return
+        
+        size, color, alpha, topleft = self._visible()
+        surface.blits(self._blits(size, color, alpha, topleft), False)
+        # One region per touched tile rather than one per particle
+        dirty_rects.add_tiles(topleft[:, 0], topleft[:, 1], int(size.max() * 2) + 1 if len(topleft) else 0)
 
 class ScreenShake:
     """Handles screen shake effects"""
@@ -110,8 +244,8 @@ class ScreenShake:
             
             # Calculate shake based on trauma
             shake = self.trauma ** self.trauma_power
-            self.offset_x = self.max_offset * shake * random.uniform(-1, 1)
-            self.offset_y = self.max_offset * shake * random.uniform(-1, 1)
+            self.offset_x = self.max_offset * shake * np_rng.uniform(-1, 1)
+            self.offset_y = self.max_offset * shake * np_rng.uniform(-1, 1)
         else:
             self.offset_x = 0
             self.offset_y = 0
@@ -153,6 +287,7 @@ class FlashEffect:
             flash_surf = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
             flash_surf.fill((*self.color, self.alpha))
             surface.blit(flash_surf, (0, 0))
+            dirty_rects.invalidate()
 
 class TextPopup:
     """Floating text popup for score, combos, etc."""
@@ -162,7 +297,9 @@ class TextPopup:
         self.y = y
         self.start_y = y
         self.color = color
-        self.font = pygame.font.SysFont('arial', font_size, bold=True)
+        self.font = asset_manager.get_font(font_size, bold=True)
+        # Rendered once; each popup owns its surface since draw changes its alpha
+        self.text_surf = self.font.render(text, True, color)
         self.lifetime = 1.0
         self.age = 0
         self.alpha = 255
@@ -179,10 +316,10 @@ class TextPopup:
     def draw(self, surface):
         """Draw popup text"""
         if self.alpha > 0:
-            text_surf = self.font.render(self.text, True, self.color)
+            text_surf = self.text_surf
             text_surf.set_alpha(self.alpha)
             text_rect = text_surf.get_rect(center=(int(self.x), int(self.y)))
-            surface.blit(text_surf, text_rect)
+            dirty_rects.add(surface.blit(text_surf, text_rect))
 
 def lerp(a, b, t):
     """Linear interpolation between a and b"""
@@ -202,3 +339,48 @@ def ease_in_out_cubic(t):
 def color_lerp(color1, color2, t):
     """Interpolate between two colors"""
     return tuple(int(lerp(color1[i], color2[i], t)) for i in range(3))
+
+# 1-px gradient strips of GRADIENT_STRIP_LENGTH keyed by (color1, color2,
+# vertical), and the full-size gradients stretched from them (both LRU,
+# since sizes and colors animate)
+_gradient_strips = OrderedDict()
+_gradient_cache = OrderedDict()
+
+def get_gradient(size, color1, color2, vertical=True):
+    """Opaque gradient surface, matching a per-scanline color_lerp fill.
+
+    Each color pair is filled once into a fixed-length strip with NumPy and
+    stretched to ``size`` with transform.scale. Callers must not draw onto
+    the returned surface.
+    """
+    width, height = size
+    key = (width, height, tuple(color1[:3]), tuple(color2[:3]), vertical)
+    surf = _gradient_cache.get(key)
+    if surf is not None:
+        _gradient_cache.move_to_end(key)
+        return surf
+
+    strip_key = key[2:]
+    strip = _gradient_strips.get(strip_key)
+    if strip is None:
+        length = GRADIENT_STRIP_LENGTH
+        t = np.arange(length) / length
+        c1 = np.array(key[2], dtype=np.float64)
+        c2 = np.array(key[3], dtype=np.float64)
+        colors = (c1 + (c2 - c1) * t[:, None]).astype(np.uint8)
+        # surfarray arrays are indexed [x, y]
+        pixels = colors[None, :, :] if vertical else colors[:, None, :]
+        strip = pygame.surfarray.make_surface(pixels)
+        if pygame.display.get_surface():
+            strip = strip.convert()
+        _gradient_strips[strip_key] = strip
+        if len(_gradient_strips) > GRADIENT_CACHE_SIZE:
+            _gradient_strips.popitem(last=False)
+    else:
+        _gradient_strips.move_to_end(strip_key)
+
+    surf = pygame.transform.scale(strip, (width, height))
+    _gradient_cache[key] = surf
+    if len(_gradient_cache) > GRADIENT_CACHE_SIZE:
+        _gradient_cache.popitem(last=False)
+    return surf
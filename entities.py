@@ -0,0 +1,218 @@
+import numpy as np
+import pygame
+from settings import *
+from pool import PooledSprite
+from game_clock import game_clock
+from dirty_rects import dirty_rects
+
+# Type ids stored in EntityStore.type_id
+ENTITY_TYPES = ('basic', 'tank', 'fast', 'shooter', 'rocket', 'meteor', 'powerup', 'powerdown')
+ENTITY_TYPE_IDS = {name: i for i, name in enumerate(ENTITY_TYPES)}
+
+class EntitySprite(PooledSprite):
+    """Sprite whose movement is owned by an EntityStore
+
+    Subclasses set their spawn state in ``reset``: ``rect``, ``velocity``
+    (pixels per tick at TUNING_FPS), and optionally ``bounce`` (reverse
+    x at the screen edges), ``sway_rate``/``sway`` (sinusoidal drift) and
+    ``fire_at`` (game-clock ms at which ``fire`` is first called). The
+    store copies that state into its columns when the sprite is added to
+    it, so sprites must join their groups at the end of ``__init__``.
+    """
+    entity_type = 'basic'
+    bounce = False
+    sway_rate = 0.0
+    sway = 0.0
+    fire_at = None
+    store = None
+    slot = None
+
+    @property
+    def health(self):
+        if self.slot is not None:
+            return int(self.store.health[self.slot])
+        return self._health
+
+    @health.setter
+    def health(self, value):
+        self._health = value
+        if self.slot is not None:
+            self.store.health[self.slot] = value
+
+    def place(self, x=None, y=None):
+        """Move the top-left corner without interpolating from the old spot"""
+        if x is not None:
+            self.rect.x = x
+        if y is not None:
+            self.rect.y = y
+        if self.slot is not None:
+            self.store.pos[self.slot] = self.store.prev[self.slot] = self.rect.topleft
+
+    def fire(self, now):
+        """Called by the store once ``fire_at`` has passed; returns the next fire time or None"""
+        return None
+
+class EntityStore(pygame.sprite.Group):
+    """Column storage and bulk movement for hostiles and pickups
+
+    A sprite group whose members are EntitySprites. Their state lives in
+    preallocated NumPy columns (float position, velocity, health, type id,
+    sprite key...) packed into the first ``count`` slots, so ``update``
+    moves every entity with a few vectorized operations and ``draw`` blits
+    straight from the arrays. Rects are written back each tick for the
+    collision code; removal swaps the last entity into the freed slot.
+    """
+    def __init__(self, capacity=256):
+        super().__init__()
+        self.count = 0
+        self.capacity = 0
+        self.images = []  # Sprite key -> surface, None once no entity uses it
+        self.image_keys = {}  # Surface -> sprite key
+        self.image_users = []  # Sprite key -> live entities using it
+        self.free_keys = []
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        """(Re)allocate the columns, keeping live entities"""
+        n = self.count
+        columns = {
+            'pos': np.zeros((capacity, 2), dtype=np.float64),
+            'prev': np.zeros((capacity, 2), dtype=np.float64),
+            'vel': np.zeros((capacity, 2), dtype=np.float64),
+            'width': np.zeros(capacity, dtype=np.int32),
+            'health': np.zeros(capacity, dtype=np.int32),
+            'type_id': np.zeros(capacity, dtype=np.int16),
+            'key': np.zeros(capacity, dtype=np.int32),
+            'bounce': np.zeros(capacity, dtype=bool),
+            'phase': np.zeros(capacity, dtype=np.float64),
+            'sway_rate': np.zeros(capacity, dtype=np.float64),
+            'sway': np.zeros(capacity, dtype=np.float64),
+            'fire_at': np.full(capacity, np.inf),
+            'members': np.empty(capacity, dtype=object),
+        }
+        for name, column in columns.items():
+            if n:
+                column[:n] = getattr(self, name)[:n]
+            setattr(self, name, column)
+        self.capacity = capacity
+
+    def image_key(self, image):
+        """Key for ``image``, counting one more entity that uses it"""
+        key = self.image_keys.get(image)
+        if key is None:
+            if self.free_keys:
+                key = self.free_keys.pop()
+                self.images[key] = image
+            else:
+                key = len(self.images)
+                self.images.append(image)
+                self.image_users.append(0)
+            self.image_keys[image] = key
+        self.image_users[key] += 1
+        return key
+
+    def release_image(self, key):
+        """Drop one user of a key; the surface is let go with its last user so
+        images evicted from the transform cache are not kept alive here"""
+        self.image_users[key] -= 1
+        if self.image_users[key] == 0:
+            del self.image_keys[self.images[key]]
+            self.images[key] = None
+            self.free_keys.append(key)
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        if self.count == self.capacity:
+            self._allocate(self.capacity * 2)
+        i = self.count
+        self.count += 1
+        sprite.store = self
+        sprite.slot = i
+        self.members[i] = sprite
+        self.pos[i] = self.prev[i] = sprite.rect.topleft
+        self.vel[i] = sprite.velocity
+        self.width[i] = sprite.rect.width
+        self.health[i] = sprite._health
+        self.type_id[i] = ENTITY_TYPE_IDS[sprite.entity_type]
+        self.key[i] = self.image_key(sprite.image)
+        self.bounce[i] = sprite.bounce
+        self.phase[i] = 0.0
+        self.sway_rate[i] = sprite.sway_rate
+        self.sway[i] = sprite.sway
+        self.fire_at[i] = np.inf if sprite.fire_at is None else sprite.fire_at
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        i = sprite.slot
+        sprite._health = int(self.health[i])
+        self.release_image(int(self.key[i]))
+        last = self.count - 1
+        if i != last:
+            moved = self.members[last]
+            for column in (self.pos, self.prev, self.vel, self.width, self.health, self.type_id, self.key,
+                           self.bounce, self.phase, self.sway_rate, self.sway, self.fire_at, self.members):
+                column[i] = column[last]
+            moved.slot = i
+        self.members[last] = None
+        self.count = last
+        sprite.slot = None
+
+    def update(self, dt=SIM_DT):
+        """Move every entity one tick, fire due shooters and drop what left the screen"""
+        n = self.count
+        if n == 0:
+            return
+        step = dt * TUNING_FPS
+        pos, vel = self.pos[:n], self.vel[:n]
+        self.prev[:n] = pos
+        pos += vel * step
+
+        # Sinusoidal drift (power-ups)
+        phase = self.phase[:n]
+        phase += self.sway_rate[:n] * step
+        pos[:, 0] += np.sin(phase) * self.sway[:n] * step
+
+        # Zigzagging shooters turn around at the screen edges
+        bounce = self.bounce[:n] & ((pos[:, 0] < 0) | (pos[:, 0] + self.width[:n] > SCREEN_WIDTH))
+        vel[bounce, 0] *= -1
+
+        # Write rects back for collision tests and the rest of the game
+        members = self.members[:n]
+        for sprite, xy in zip(members, np.floor(pos).astype(np.int32).tolist()):
+            sprite.rect.topleft = xy
+
+        now = game_clock.get_ticks()
+        due = np.flatnonzero(self.fire_at[:n] < now)
+        for sprite in members[due].tolist():
+            fire_at = sprite.fire(now)
+            self.fire_at[sprite.slot] = np.inf if fire_at is None else fire_at
+
+        gone = members[pos[:, 1] > SCREEN_HEIGHT].tolist()
+        for sprite in gone:
+            sprite.kill()
+
+    def settle(self):
+        """Forget the previous tick so the next draw shows current positions"""
+        self.prev[:self.count] = self.pos[:self.count]
+
+    def blit_list(self, alpha=1.0):
+        """``(image, (x, y))`` of every entity, ``alpha`` of the way through the tick"""
+        n = self.count
+        if n == 0:
+            return []
+        pos = self.pos[:n]
+        if alpha < 1.0:
+            prev = self.prev[:n]
+            pos = prev + (pos - prev) * alpha
+        images = self.images
+        return [(images[key], xy)
+                for key, xy in zip(self.key[:n].tolist(), np.floor(pos).astype(np.int32).tolist())]
+
+    def draw(self, surface, alpha=1.0):
+        """Blit every entity from the arrays, ``alpha`` of the way through the tick"""
+        blits = self.blit_list(alpha)
+        if not blits:
+            return
+        rects = surface.blits(blits, dirty_rects.enabled)
+        if rects:
+            dirty_rects.extend(rects)
@@ -0,0 +1,33 @@
+import pygame
+
+class GameClock:
+    """Source of game time in milliseconds
+
+    By default it follows pygame's wall clock. In virtual mode time only
+    moves when ``advance`` is called, so the simulation can run faster than
+    real time.
+    """
+    def __init__(self):
+        self.virtual = False
+        self.time = 0.0
+
+    def use_virtual(self, start=0):
+        """Switch to virtual time starting at ``start`` ms"""
+        self.virtual = True
+        self.time = float(start)
+
+    def use_wall_clock(self):
+        """Switch back to pygame's wall clock"""
+        self.virtual = False
+
+    def get_ticks(self):
+        """Milliseconds since the clock started, like pygame.time.get_ticks"""
+        if self.virtual:
+            return int(self.time)
+        return pygame.time.get_ticks()
+
+    def advance(self, millis):
+        """Advance virtual time"""
+        self.time += millis
+
+game_clock = GameClock()
@@ -1,18 +1,30 @@
 
 import pygame
 import sys
-import random
 from settings import *
-from sprites import Player, Bullet, Enemy, Meteor, Explosion, EnemyShooter, EnemyRocket, PowerUp, PowerDown
+from sprites import Player, Bullet, Enemy, Meteor, Explosion, EnemyShooter, EnemyRocket, PowerUp, PowerDown, GAMEPLAY_ASSETS
+from asset_manager import asset_manager
+from audio_manager import audio_manager
 from ui import UI
 from effects import ParticleSystem
 from story_mode import StoryMode
+from spatial_hash import SpatialHash
+from scheduler import Scheduler
+from entities import EntityStore
+from game_clock import game_clock
+from game_random import rng
+from profiler import profiler
+from pool import SpritePool
+from dirty_rects import dirty_rects
 
 class GameManager:
     def __init__(self, surface):
         self.display_surface = surface
         self.ui = UI(self.display_surface)
         self.fullscreen_callback = None  # Will be set by main game
+        self.quit_callback = None  # Exits the process when unset
+        self.key_source = pygame.key.get_pressed  # Handed to each new Player (replays swap it)
+        self.sprite_layer = None  # Takes over sprite drawing when rendering with textures
         
         # Story mode system
         self.story_mode = StoryMode()
@@ -38,6 +50,34 @@ class GameManager:
         self.powerups = pygame.sprite.Group()
         self.powerdowns = pygame.sprite.Group()
         self.all_sprites = pygame.sprite.Group()
+        
+        # Enemies, meteors and pickups are moved and drawn in bulk from arrays
+        # instead of through visible_sprites/all_sprites
+        self.entities = EntityStore()
+        
+        # Collision broadphase grids, rebuilt every tick
+        self.bullet_grid = SpatialHash()
+        self.obstacle_grid = SpatialHash()
+        self.enemy_bullet_grid = SpatialHash()
+        self.powerup_grid = SpatialHash()
+        self.powerdown_grid = SpatialHash()
+        
+        # Narrow phase run on the grid's rect hits
+        self.collided = pygame.sprite.collide_mask if PIXEL_COLLISIONS else None
+        self.collision_count = 0  # Hits resolved since startup, read by telemetry
+        
+        # Sprite pools, reused across spawns instead of reallocating
+        self.player_bullet_pool = SpritePool(lambda groups, pos: Bullet(pos, groups, is_player=True))
+        self.enemy_bullet_pool = SpritePool(lambda groups, pos: Bullet(pos, groups, is_player=False))
+        self.enemy_pools = {
+            'shooter': SpritePool(EnemyShooter),
+            'rocket': SpritePool(EnemyRocket),
+        }
+        self.meteor_pool = SpritePool(Meteor)
+        self.explosion_pool = SpritePool(lambda groups, pos: Explosion(pos, groups))
+        
+        # Sprite positions before the last simulation tick, for render interpolation
+        self.prev_positions = {}
 
         # Game State
         self.game_active = False
@@ -47,31 +87,34 @@ class GameManager:
         self.enemies_spawned = 0
         self.wave_enemies_remaining = 0
         self.story_start_time = 0
+        self.last_scene = None  # Redraw everything when this changes
         
-        # Timers
-        self.enemy_spawn_timer = pygame.event.custom_type()
-        self.meteor_spawn_timer = pygame.event.custom_type()
-        self.powerup_spawn_timer = pygame.event.custom_type()
-        self.powerdown_spawn_timer = pygame.event.custom_type()
-        pygame.time.set_timer(self.enemy_spawn_timer, 1500)
-        pygame.time.set_timer(self.meteor_spawn_timer, 2000)
+        # Spawning runs on simulation time, so it pauses with the game
+        self.scheduler = Scheduler()
+        self.spawners = {
+            'enemy': self.create_enemy,
+            'meteor': self.create_meteor,
+            'powerup': self.create_powerup,
+            'powerdown': self.create_powerdown,
+        }
 
         # Player
         self.player = None
 
         # Audio
-        try:
-            self.collision_sound = pygame.mixer.Sound(COLLISION_SOUND_PATH)
-        except Exception as e:
-            print(f"Failed to load collision sound: {e}")
-            self.collision_sound = None
+        audio_manager.load('collision', COLLISION_SOUND_PATH)
 
     def start_game(self, mode='endless', story_id=None):
         self.game_active = True
         self.game_state = 'playing'
         self.game_mode = mode
         
-        # Reset groups
+        # Decode gameplay sprites now rather than on first spawn
+        asset_manager.preload(GAMEPLAY_ASSETS)
+        
+        # Reset groups, returning pooled sprites to their pools
+        for sprite in self.all_sprites.sprites() + self.entities.sprites():
+            sprite.kill()
         self.visible_sprites.empty()
         self.obstacle_sprites.empty()
         self.player_bullets.empty()
@@ -79,10 +122,18 @@ class GameManager:
         self.powerups.empty()
         self.powerdowns.empty()
         self.all_sprites.empty()
+        self.prev_positions.clear()
+        
+        # Restart the spawn timeline
+        self.scheduler.clear()
+        if mode == 'endless':
+            self.scheduler.schedule('enemy', ENEMY_SPAWN_INTERVAL, self.create_enemy)
+            self.scheduler.schedule('meteor', METEOR_SPAWN_INTERVAL, self.create_meteor)
         
         # Create Player
         self.player = Player([self.visible_sprites, self.all_sprites])
         self.player.create_bullet_callback = self.create_player_bullet
+        self.player.key_source = self.key_source
         
         if mode == 'story' and story_id:
             self.start_story(story_id)
@@ -92,7 +143,7 @@ class GameManager:
         if self.story_mode.start_story(story_id):
             self.current_story_id = story_id
             self.enemies_spawned = 0
-            self.story_start_time = pygame.time.get_ticks()
+            self.story_start_time = game_clock.get_ticks()
             
             story = self.story_mode.current_story
             
@@ -103,9 +154,8 @@ class GameManager:
                 elif challenge.type == 'shoot_cooldown':
                     self.player.shoot_delay = challenge.value
             
-            # Set up timers for story mode
-            pygame.time.set_timer(self.powerup_spawn_timer, story.power_up_spawn_rate)
-            pygame.time.set_timer(self.powerdown_spawn_timer, story.power_down_spawn_rate)
+            # Set up spawning for story mode
+            self.schedule_spawns(self.story_mode.compile_story(story))
             
             # Start first wave
             self.start_wave()
@@ -117,16 +167,38 @@ class GameManager:
             self.wave_enemies_remaining = wave.enemy_count
             self.enemies_spawned = 0
             
-            # Adjust spawn timer based on wave
-            pygame.time.set_timer(self.enemy_spawn_timer, wave.spawn_interval)
-            pygame.time.set_timer(self.meteor_spawn_timer, 3000 if wave.meteor_count > 0 else 0)
+            # Replace the previous wave's spawning
+            self.schedule_spawns(self.story_mode.compile_wave(wave))
+
+    def schedule_spawns(self, rules):
+        """Put compiled SpawnRules on the spawn timeline"""
+        for rule in rules:
+            self.scheduler.schedule(rule.kind, rule.interval, self.spawners[rule.kind], rule.count)
+
+    def spawn(self, pool, groups, *args):
+        """Take a sprite from ``pool``; a reused one must not interpolate from its last life"""
+        sprite = pool.acquire(groups, *args)
+        self.prev_positions.pop(sprite, None)
+        return sprite
 
     def create_player_bullet(self, x, y):
-        Bullet((x, y), [self.visible_sprites, self.player_bullets, self.all_sprites], is_player=True)
+        self.spawn(self.player_bullet_pool, [self.visible_sprites, self.player_bullets, self.all_sprites], (x, y))
     
     def create_enemy_bullet(self, x, y):
         """Create enemy bullet"""
-        Bullet((x, y), [self.visible_sprites, self.enemy_bullets, self.all_sprites], is_player=False)
+        self.spawn(self.enemy_bullet_pool, [self.visible_sprites, self.enemy_bullets, self.all_sprites], (x, y))
+    
+    def get_enemy_pool(self, enemy_type):
+        """Pool for an enemy type, created on first use"""
+        pool = self.enemy_pools.get(enemy_type)
+        if pool is None:
+            pool = SpritePool(lambda groups: Enemy(groups, enemy_type))
+            self.enemy_pools[enemy_type] = pool
+        return pool
+    
+    def create_explosion(self, pos):
+        """Spawn an explosion sprite"""
+        self.spawn(self.explosion_pool, [self.visible_sprites, self.all_sprites], pos)
 
     def create_enemy(self):
         """Create enemies based on game mode"""
@@ -134,47 +206,52 @@ class GameManager:
             wave = self.story_mode.get_current_wave()
             if wave and self.enemies_spawned < wave.enemy_count:
                 # Select random enemy type from wave
-                enemy_type = random.choice(wave.enemy_types)
+                enemy_type = rng.choice(wave.enemy_types)
                 
+                enemy = self.spawn(self.get_enemy_pool(enemy_type),
+                    [self.entities, self.obstacle_sprites])
                 if enemy_type == 'shooter':
-                    enemy = EnemyShooter([self.visible_sprites, self.obstacle_sprites, self.all_sprites])
                     enemy.create_bullet_callback = self.create_enemy_bullet
-                elif enemy_type == 'rocket':
-                    EnemyRocket([self.visible_sprites, self.obstacle_sprites, self.all_sprites])
-                else:
-                    Enemy([self.visible_sprites, self.obstacle_sprites, self.all_sprites], enemy_type)
                 
                 self.enemies_spawned += 1
         else:
             # Endless mode
-            Enemy([self.visible_sprites, self.obstacle_sprites, self.all_sprites])
+            self.spawn(self.get_enemy_pool('basic'), [self.entities, self.obstacle_sprites])
 
     def create_meteor(self):
-        Meteor([self.visible_sprites, self.obstacle_sprites, self.all_sprites])
+        self.spawn(self.meteor_pool, [self.entities, self.obstacle_sprites])
     
     def create_powerup(self):
         """Spawn a random power-up"""
         power_types = ['health', 'speed_boost', 'invincibility', 'rapid_fire', 'shield']
-        power_type = random.choice(power_types)
-        x_pos = random.randint(50, SCREEN_WIDTH - 50)
-        PowerUp((x_pos, -30), [self.visible_sprites, self.powerups, self.all_sprites], power_type)
+        power_type = rng.choice(power_types)
+        x_pos = rng.randint(50, SCREEN_WIDTH - 50)
+        PowerUp((x_pos, -30), [self.entities, self.powerups], power_type)
     
     def create_powerdown(self):
         """Spawn a random power-down"""
         debuff_types = ['slow', 'weak_bullets', 'reverse_controls']
-        debuff_type = random.choice(debuff_types)
-        x_pos = random.randint(50, SCREEN_WIDTH - 50)
-        PowerDown((x_pos, -30), [self.visible_sprites, self.powerdowns, self.all_sprites], debuff_type)
+        debuff_type = rng.choice(debuff_types)
+        x_pos = rng.randint(50, SCREEN_WIDTH - 50)
+        PowerDown((x_pos, -30), [self.entities, self.powerdowns], debuff_type)
 
     def check_collisions(self):
         if not self.player: return
+        
+        # Rebuild broadphase grids from this tick's rects
+        self.bullet_grid.build(self.player_bullets)
+        self.obstacle_grid.build(self.obstacle_sprites)
+        self.enemy_bullet_grid.build(self.enemy_bullets)
+        self.powerup_grid.build(self.powerups)
+        self.powerdown_grid.build(self.powerdowns)
 
         # Player Bullets vs Enemies/Meteors
-        hits = pygame.sprite.groupcollide(self.obstacle_sprites, self.player_bullets, True, True)
+        hits = self.bullet_grid.groupcollide(self.obstacle_sprites, True, True, self.collided)
+        self.collision_count += len(hits)
         if hits:
             for hit_sprite in hits:
-                if self.collision_sound: self.collision_sound.play()
-                Explosion(hit_sprite.rect.center, [self.visible_sprites, self.all_sprites])
+                audio_manager.play('collision')
+                self.create_explosion(hit_sprite.rect.center)
                 
                 # Add score with popup
                 points = 100
@@ -202,10 +279,11 @@ class GameManager:
 
         # Player vs Obstacles (with shield/invincibility check)
         if not self.player.invincible:
-            collide_sprites = pygame.sprite.spritecollide(self.player, self.obstacle_sprites, True)
+            collide_sprites = self.obstacle_grid.spritecollide(self.player, True, self.collided)
+            self.collision_count += len(collide_sprites)
             if collide_sprites:
                 for sprite in collide_sprites:
-                    if self.collision_sound: self.collision_sound.play()
+                    audio_manager.play('collision')
                     
                     # Shield absorbs damage
                     if self.player.shield_active:
@@ -215,7 +293,7 @@ class GameManager:
                         damage = 20
                     
                     self.player.health -= damage
-                    Explosion(sprite.rect.center, [self.visible_sprites, self.all_sprites])
+                    self.create_explosion(sprite.rect.center)
                     
                     # Visual feedback for damage
                     self.ui.trigger_screen_shake(SCREEN_SHAKE_TRAUMA)
@@ -234,7 +312,8 @@ class GameManager:
         
         # Enemy bullets vs Player
         if not self.player.invincible:
-            bullet_hits = pygame.sprite.spritecollide(self.player, self.enemy_bullets, True)
+            bullet_hits = self.enemy_bullet_grid.spritecollide(self.player, True, self.collided)
+            self.collision_count += len(bullet_hits)
             if bullet_hits:
                 for bullet in bullet_hits:
                     if self.player.shield_active:
@@ -250,7 +329,8 @@ class GameManager:
                         self.game_over()
         
         # Player vs Power-ups
-        powerup_hits = pygame.sprite.spritecollide(self.player, self.powerups, True)
+        powerup_hits = self.powerup_grid.spritecollide(self.player, True, self.collided)
+        self.collision_count += len(powerup_hits)
         for powerup in powerup_hits:
             self.player.apply_powerup(powerup.power_type)
             self.ui.add_score_popup(powerup.rect.centerx, powerup.rect.centery, f"+{powerup.power_type.upper()}", (50, 255, 100))
@@ -262,7 +342,8 @@ class GameManager:
             )
         
         # Player vs Power-downs
-        powerdown_hits = pygame.sprite.spritecollide(self.player, self.powerdowns, True)
+        powerdown_hits = self.powerdown_grid.spritecollide(self.player, True, self.collided)
+        self.collision_count += len(powerdown_hits)
         for powerdown in powerdown_hits:
             self.player.apply_powerdown(powerdown.debuff_type)
             self.ui.add_score_popup(powerdown.rect.centerx, powerdown.rect.centery, f"-{powerdown.debuff_type.upper()}", (255, 50, 50))
@@ -277,7 +358,7 @@ class GameManager:
         self.game_active = False
         self.game_state = 'game_over'
         # Maybe show explosion on player
-        Explosion(self.player.rect.center, [self.visible_sprites, self.all_sprites])
+        self.create_explosion(self.player.rect.center)
         # Big explosion effect
         self.ui.particle_system.emit_explosion(
             self.player.rect.centerx,
@@ -299,6 +380,12 @@ class GameManager:
     def show_story_select(self):
         """Show story selection screen"""
         self.game_state = 'story_select'
+        
+        # Create story buttons if not already created; done here rather than
+        # in draw so headless and replayed sessions can click them too
+        if not self.ui.story_buttons:
+            stories = self.story_mode.get_all_stories()
+            self.ui.create_story_buttons(stories, lambda sid: self.start_game('story', sid))
     
     def return_to_menu(self):
         """Return to main menu"""
@@ -307,6 +394,9 @@ class GameManager:
     
     def quit_game(self):
         """Quit the game"""
+        if self.quit_callback:
+            self.quit_callback()
+            return
         pygame.quit()
         sys.exit()
     
@@ -335,28 +425,26 @@ class GameManager:
                 if event.key == pygame.K_ESCAPE:
                     self.return_to_menu()
 
-        if self.game_active:
-            if event.type == self.enemy_spawn_timer:
-                self.create_enemy()
-            if event.type == self.meteor_spawn_timer:
-                self.create_meteor()
-            if event.type == self.powerup_spawn_timer:
-                self.create_powerup()
-            if event.type == self.powerdown_spawn_timer:
-                self.create_powerdown()
 
-    def update(self):
+    def update(self, dt=SIM_DT):
+        """Advance the simulation by one fixed tick of ``dt`` seconds"""
         # Always update UI animations
-        dt = 1 / FPS  # Delta time
         self.ui.update(dt, self.game_state)
         
         # Don't update game if narrative is showing
         if self.game_mode == 'story' and self.story_mode.show_narrative:
+            self.prev_positions.clear()
+            self.entities.settle()
             return
         
         if self.game_active:
-            self.all_sprites.update()
-            self.check_collisions()
+            self.scheduler.advance(dt * 1000)
+            with profiler.span('sprites_update'):
+                self.prev_positions = {sprite: sprite.rect.topleft for sprite in self.all_sprites}
+                self.all_sprites.update(dt)
+                self.entities.update(dt)
+            with profiler.span('collisions'):
+                self.check_collisions()
             
             # Check story mode challenges
             if self.game_mode == 'story' and self.story_mode.current_story:
@@ -364,7 +452,7 @@ class GameManager:
                 for challenge in self.story_mode.current_story.challenges:
                     if challenge.type == 'time_limit':
                         # Account for pause time from narrative
-                        elapsed = (pygame.time.get_ticks() - self.story_start_time - self.story_mode.total_pause_time) // 1000
+                        elapsed = (game_clock.get_ticks() - self.story_start_time - self.story_mode.total_pause_time) // 1000
                         remaining = challenge.value - elapsed
                         self.story_mode.update_challenge('time_limit', remaining)
                         
@@ -377,39 +465,66 @@ class GameManager:
                     if len(self.obstacle_sprites) > 0:
                         self.game_over()
 
-    def draw(self):
-        if self.game_state == 'playing':
-            # Draw starfield background
+    def draw_sprites(self, alpha=1.0):
+        """Draw the star field, then entities and visible sprites ``alpha`` of the way from their last tick to the current one
+
+        With a sprite layer the stars are handed over with the sprites, so a
+        texture renderer draws them as copies instead of blits onto the surface.
+        """
+        if self.sprite_layer is not None:
+            with profiler.span('particles_draw'):
+                blits = self.ui.particle_system.blit_list()
+            blits += self.entities.blit_list(alpha)
+        else:
             self.ui.particle_system.draw(self.display_surface)
-            
-            # Draw game sprites
-            self.visible_sprites.draw(self.display_surface)
+            blits = self.entities.blit_list(alpha)
+        prev_positions = self.prev_positions
+        for sprite in self.visible_sprites:
+            x, y = sprite.rect.topleft
+            prev = prev_positions.get(sprite)
+            if prev is not None and alpha < 1.0:
+                x = prev[0] + (x - prev[0]) * alpha
+                y = prev[1] + (y - prev[1]) * alpha
+            blits.append((sprite.image, (round(x), round(y))))
+        if self.sprite_layer is not None:
+            self.sprite_layer.draw_sprites(blits)
+            return
+        rects = self.display_surface.blits(blits, dirty_rects.enabled)
+        if rects:
+            dirty_rects.extend(rects)
+
+    def draw(self, alpha=1.0):
+        """Render the current state; ``alpha`` is how far the clock is into the next tick"""
+        # Whole screens appear or disappear on state changes
+        scene = (self.game_state, self.game_mode, self.story_mode.show_narrative)
+        if scene != self.last_scene:
+            self.last_scene = scene
+            dirty_rects.invalidate()
+        
+        if self.game_state == 'playing':
+            # Draw starfield background and game sprites, interpolated while the simulation is running
+            self.draw_sprites(alpha)
             
             # Draw HUD based on mode
-            if self.game_mode == 'story':
-                self.ui.display_story_hud(self.player, self.story_mode)
-                
-                # Show narrative if active
-                if self.story_mode.show_narrative:
-                    self.ui.display_narrative(self.story_mode.current_story.narrative)
-            else:
-                self.ui.display_hud(self.player)
+            with profiler.span('hud'):
+                if self.game_mode == 'story':
+                    self.ui.display_story_hud(self.player, self.story_mode)
+                    
+                    # Show narrative if active
+                    if self.story_mode.show_narrative:
+                        self.ui.display_narrative(self.story_mode.current_story.narrative)
+                else:
+                    self.ui.display_hud(self.player)
             
             # Draw flash effect
             self.ui.flash_effect.draw(self.display_surface)
             
         elif self.game_state == 'story_select':
-            # Create story buttons if not already created
-            if not self.ui.story_buttons:
-                stories = self.story_mode.get_all_stories()
-                self.ui.create_story_buttons(stories, lambda sid: self.start_game('story', sid))
-            
             self.ui.show_story_select(self.story_mode.get_all_stories())
             
         elif self.game_state == 'story_complete':
             # Draw final game state
-            self.ui.particle_system.draw(self.display_surface)
-            self.visible_sprites.draw(self.display_surface)
+            self.draw_sprites()
             self.ui.show_story_complete(
                 self.story_mode.current_story,
                 self.player.score if self.player else 0
@@ -417,8 +532,7 @@ class GameManager:
             
         elif self.game_state == 'game_over':
             # Draw final game state
-            self.ui.particle_system.draw(self.display_surface)
-            self.visible_sprites.draw(self.display_surface)
+            self.draw_sprites()
             self.ui.show_game_over(self.player.score if self.player else 0)
             
         else:  # menu
@@ -0,0 +1,29 @@
+import numpy as np
+import random
+
+class GameRandom:
+    """Random sources shared by all gameplay and effects code
+
+    Everything that affects a session draws from ``rng`` (the ``random``
+    API) or ``np_rng`` (NumPy, used by the particle system), never from the
+    module-level ``random`` functions. Seeding both makes a session
+    reproducible from its inputs, which replays and benchmarks rely on.
+    """
+    def __init__(self):
+        self.rng = random.Random()
+        self.np_rng = np.random.default_rng()
+        self.seed_value = None
+
+    def seed(self, value=None):
+        """Reseed both sources in place; ``None`` picks a fresh random seed"""
+        if value is None:
+            value = random.SystemRandom().randrange(2 ** 32)
+        self.seed_value = value
+        self.rng.seed(value)
+        # Reseed in place so holders of np_rng see the new stream
+        self.np_rng.bit_generator.state = np.random.PCG64(value).state
+        return value
+
+game_random = GameRandom()
+rng = game_random.rng
+np_rng = game_random.np_rng
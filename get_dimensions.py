@@ -1,5 +1,6 @@
 import os
 import sys
+import json
 
 try:
     from PIL import Image
@@ -7,21 +8,21 @@ except ImportError:
     print("PIL not installed")
     sys.exit(1)
 
-start_dir = '/home/codiac/Desktop/Projects/Python/SPACE-SHOOTER/Sprites'
-base_dir = '/home/codiac/Desktop/Projects/Python/SPACE-SHOOTER'
+from settings import BASE_DIR, SPRITES_DIR, MANIFEST_PATH
+from asset_manager import image_key
 
 img_extensions = {'.png', '.jpg', '.jpeg', '.bmp', '.gif'}
 
 images = []
 
-for root, dirs, files in os.walk(start_dir):
+for root, dirs, files in os.walk(SPRITES_DIR):
     for f in files:
         if os.path.splitext(f)[1].lower() in img_extensions:
             full_path = os.path.join(root, f)
             try:
                 with Image.open(full_path) as img:
                     width, height = img.size
-                    rel_path = os.path.relpath(full_path, base_dir)
+                    rel_path = os.path.relpath(full_path, BASE_DIR)
                     images.append((rel_path, width, height))
             except Exception as e:
                 pass
@@ -29,6 +30,24 @@ for root, dirs, files in os.walk(start_dir):
 # Sort for consistent output
 images.sort()
 
-with open('sprites_list.txt', 'w') as f:
+with open(os.path.join(BASE_DIR, 'sprites_list.txt'), 'w') as f:
     for path, w, h in images:
         f.write(f"{path} {w} {h}\n")
+
+# Manifest read by AssetManager.load_manifest for lazy loading
+manifest = {
+    'version': 1,
+    'images': [
+        {
+            'key': image_key(os.path.relpath(os.path.join(BASE_DIR, path), SPRITES_DIR)),
+            'path': path.replace(os.sep, '/'),
+            'width': w,
+            'height': h,
+        }
+        for path, w, h in images
+    ],
+}
+
+with open(MANIFEST_PATH, 'w') as f:
+    json.dump(manifest, f, indent=1)
+    f.write("\n")
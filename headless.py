@@ -0,0 +1,93 @@
+import os
+
+# Must be set before pygame initializes its video/audio subsystems
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')  # Keep stdout machine-readable
+
+import argparse
+import json
+import time
+import pygame
+from settings import *
+from asset_manager import asset_manager
+from game_clock import game_clock
+
+class HeadlessRunner:
+    """Runs GameManager without a window on a virtual clock
+
+    Each tick advances the game clock by a fixed step and calls
+    ``GameManager.update`` (which runs the spawn scheduler and
+    ``check_collisions``). Nothing is drawn, so sessions run as fast as the
+    CPU allows.
+    """
+    def __init__(self, fps=SIM_RATE, surface=None):
+        self.tick_ms = 1000 / fps
+
+        pygame.init()
+        pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        game_clock.use_virtual()
+        if not asset_manager.images and not asset_manager.manifest:
+            asset_manager.load_manifest()
+            asset_manager.load_atlas()
+
+        from game_manager import GameManager
+        self.game_manager = GameManager(surface or pygame.display.get_surface())
+        self.ticks = 0
+
+    def start(self, mode='endless', story_id=None, key_source=None, skip_narrative=True):
+        """Start a new session, optionally driving the player with ``key_source``"""
+        gm = self.game_manager
+        gm.start_game(mode, story_id)
+        if key_source:
+            gm.player.key_source = key_source
+
+        # Page through the briefing the same way a player would
+        while skip_narrative and gm.game_mode == 'story' and gm.story_mode.show_narrative:
+            gm.handle_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+
+    def step(self):
+        """Advance the simulation by one fixed tick"""
+        gm = self.game_manager
+        game_clock.advance(self.tick_ms)
+        gm.update(self.tick_ms / 1000)
+        self.ticks += 1
+
+    def run(self, max_seconds=600):
+        """Step until the session ends or ``max_seconds`` of game time pass"""
+        gm = self.game_manager
+        max_ticks = int(max_seconds * 1000 / self.tick_ms)
+        start_ticks = self.ticks
+        start = time.perf_counter()
+
+        while gm.game_state == 'playing' and self.ticks - start_ticks < max_ticks:
+            self.step()
+
+        wall = time.perf_counter() - start
+        ticks = self.ticks - start_ticks
+        return {
+            'state': gm.game_state,
+            'score': gm.player.score if gm.player else 0,
+            'ticks': ticks,
+            'sim_seconds': ticks * self.tick_ms / 1000,
+            'wall_seconds': wall,
+            'ticks_per_second': ticks / wall if wall > 0 else float('inf'),
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Space Shooter sessions headless on a virtual clock")
+    parser.add_argument('--mode', choices=['endless', 'story'], default='story')
+    parser.add_argument('--story', type=int, default=1, help="story id for story mode")
+    parser.add_argument('--sessions', type=int, default=1)
+    parser.add_argument('--max-seconds', type=float, default=600, help="game-time cap per session")
+    parser.add_argument('--fps', type=int, default=SIM_RATE, help="simulation ticks per game second")
+    args = parser.parse_args()
+
+    runner = HeadlessRunner(args.fps)
+    for _ in range(args.sessions):
+        runner.start(args.mode, args.story if args.mode == 'story' else None)
+        print(json.dumps(runner.run(args.max_seconds)))
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
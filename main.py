@@ -1,92 +1,208 @@
 
+import argparse
 import pygame
 import sys
 from settings import *
 from asset_manager import asset_manager
+from audio_manager import audio_manager
 from game_manager import GameManager
+from sprites import GAMEPLAY_ASSETS
+from game_clock import game_clock
+from game_random import game_random
+from replay import ReplayRecorder
+from profiler import profiler, ProfilerOverlay
+from ui import draw_loading_screen
+from dirty_rects import dirty_rects
+from presenter import create_presenter
+from telemetry import TelemetryWriter, SessionTelemetry, session_path
 
 class Game:
-    def __init__(self, width=SCREEN_WIDTH, height=SCREEN_HEIGHT):
+    def __init__(self, width=SCREEN_WIDTH, height=SCREEN_HEIGHT, record_path=None, replay=None,
+                 renderer=RENDER_BACKEND, telemetry_path=None):
+        # The mixer has to be opened with its small buffer before pygame.init
+        audio_manager.init()
         pygame.init()
         self.width = width
         self.height = height
-        self.fullscreen = FULLSCREEN
         
-        # Set initial display mode
-        if self.fullscreen:
-            self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-            # Get actual fullscreen dimensions
-            self.width = self.screen.get_width()
-            self.height = self.screen.get_height()
-        else:
-            self.screen = pygame.display.set_mode((width, height))
+        # Everything is drawn at the logical size and scaled to the window
+        self.presenter = create_presenter(renderer, (width, height), FULLSCREEN)
+        self.screen = self.presenter.surface
         
         pygame.display.set_caption("Space Shooter")
         self.clock = pygame.time.Clock()
         self.running = True
+        self.accumulator = 0.0  # Real time not yet consumed by simulation ticks
+        self.profiler_overlay = ProfilerOverlay()
         
-        # Initialize Audio
+        # Initialize Audio; effects are played through audio_manager
         try:
-            pygame.mixer.init()
             pygame.mixer.music.load(BG_MUSIC_PATH)
             pygame.mixer.music.play(loops=-1)
             print("Background music started.")
         except Exception as e:
             print(f"Error loading music: {e}")
         
-        # Load assets
-        print("Loading assets...")
-        asset_manager.load_images()
-        print("Assets loaded.")
+        # Index assets; images come from the prebuilt atlas cache when it is
+        # fresh. Otherwise the sprites gameplay needs are decoded on
+        # background threads while run() shows the loading screen, and
+        # everything else stays on disk until first use (the UI draws no images)
+        asset_manager.load_manifest()
+        asset_manager.load_atlas()
+        asset_manager.start_loading(GAMEPLAY_ASSETS)
+        
+        # Game time only advances in whole simulation ticks
+        game_clock.use_virtual()
+        
+        # Seeded randomness plus per-tick input makes a session replayable
+        self.record_path = record_path
+        self.replay = replay
+        self.recorder = None
+        if replay:
+            if replay.sim_rate != SIM_RATE:
+                raise ValueError(f"Replay was recorded at {replay.sim_rate} ticks/s, game runs at {SIM_RATE}")
+            game_random.seed(replay.seed)
+        else:
+            seed = game_random.seed()
+            if record_path:
+                self.recorder = ReplayRecorder(seed)
+        self.input_source = replay or self.recorder
 
-        # Initialize Game Manager
-        self.game_manager = GameManager(self.screen)
-        self.game_manager.fullscreen_callback = self.toggle_fullscreen
+        # Sampled frame and game statistics, written off the main thread
+        self.telemetry = None
+        if telemetry_path:
+            self.telemetry = SessionTelemetry(TelemetryWriter(telemetry_path), seed=game_random.seed_value)
 
-    def run(self):
+        # Game Manager is created by load() once its images are ready
+        self.game_manager = None
+
+    def create_game_manager(self):
+        game_manager = GameManager(self.screen)
+        game_manager.fullscreen_callback = self.toggle_fullscreen
+        game_manager.quit_callback = self.stop
+        game_manager.sprite_layer = self.presenter.sprite_layer
+        if self.input_source:
+            game_manager.key_source = self.input_source.key_state
+        return game_manager
+
+    def load(self):
+        """Show the loading screen until background decoding finishes, then build the game"""
         while self.running:
+            done = asset_manager.poll_loading(LOADING_CONVERT_BUDGET_MS)
+            for event in pygame.event.get():
+                if event.type in (pygame.QUIT, pygame.WINDOWCLOSE):
+                    self.running = False
+                elif event.type in (pygame.WINDOWRESIZED, pygame.WINDOWSIZECHANGED):
+                    self.presenter.resized()
+            draw_loading_screen(self.screen, asset_manager.loading_progress())
+            self.presenter.present()
+            if done:
+                break
             self.clock.tick(FPS)
+
+        if self.running:
+            self.game_manager = self.create_game_manager()
+        self.clock.tick()  # Loading time is not frame time
+
+    def run(self):
+        if self.game_manager is None:
+            self.load()
+        while self.running:
+            # Real frame time, capped so a stall doesn't trigger a long catch-up
+            real_frame_time = self.clock.tick(FPS) / 1000
+            frame_time = min(real_frame_time, MAX_FRAME_TIME)
+            self.accumulator += frame_time
+            profiler.begin_frame()
             self.events()
-            self.update()
-            self.draw()
+            ticks = 0
+            while self.accumulator >= SIM_DT and self.running:
+                self.update()
+                ticks += 1
+                self.accumulator -= SIM_DT
+                if self.replay and self.replay.finished:
+                    self.running = False
+            self.draw(self.accumulator / SIM_DT)
+            profiler.end_frame()
+            if self.telemetry:
+                self.telemetry.frame(real_frame_time, ticks, self.game_manager)
 
     def events(self):
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                self.running = False
-            
-            # Pass events to Game Manager
-            self.game_manager.handle_event(event)
+        with profiler.span('events'):
+            for event in pygame.event.get():
+                # With the SDL2 backend a hidden display window stays open, so closing ours sends no QUIT
+                if event.type in (pygame.QUIT, pygame.WINDOWCLOSE):
+                    self.running = False
+                
+                # Window contents were lost or resized
+                if event.type in (pygame.WINDOWRESIZED, pygame.WINDOWSIZECHANGED):
+                    self.presenter.resized()
+                elif event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                    dirty_rects.invalidate()
+                event = self.presenter.map_event(event)
+                
+                # Profiler overlay and dumps, dirty rect presentation
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_F3:
+                        profiler.toggle()
+                    elif event.key == pygame.K_F4 and profiler.filled:
+                        for path in profiler.dump():
+                            print(f"Profile written to {path}")
+                    elif event.key == pygame.K_F5:
+                        dirty_rects.toggle()
+                        print(f"Dirty rects {'on' if dirty_rects.enabled else 'off'}")
+                
+                # Pass events to Game Manager; a replay supplies its own
+                if self.replay:
+                    continue
+                if self.recorder:
+                    self.recorder.record_event(event)
+                self.game_manager.handle_event(event)
 
     def update(self):
-        self.game_manager.update()
+        """One fixed simulation tick: apply recorded input, advance the clock, step the game"""
+        if self.input_source:
+            for event in self.input_source.begin_tick():
+                self.game_manager.handle_event(event)
+        game_clock.advance(SIM_DT * 1000)
+        self.game_manager.update(SIM_DT)
 
-    def draw(self):
+    def draw(self, alpha=1.0):
         self.screen.fill(UI_BG_DARK)
-        self.game_manager.draw()
-        pygame.display.flip()
+        self.game_manager.draw(alpha)
+        if profiler.enabled:
+            self.profiler_overlay.draw(self.screen, profiler)
+            dirty_rects.invalidate()
+        with profiler.span('flip'):
+            self.presenter.present()
     
     def toggle_fullscreen(self):
-        """Toggle between fullscreen and windowed mode"""
-        self.fullscreen = not self.fullscreen
-        
-        if self.fullscreen:
-            self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-            self.width = self.screen.get_width()
-            self.height = self.screen.get_height()
-        else:
-            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-            self.width = SCREEN_WIDTH
-            self.height = SCREEN_HEIGHT
-        
-        # Reinitialize game manager with new screen
-        self.game_manager = GameManager(self.screen)
+        """Toggle between fullscreen and windowed mode; the game keeps running as is"""
+        self.presenter.toggle_fullscreen()
+
+    def stop(self):
+        self.running = False
 
     def quit(self):
+        if self.telemetry:
+            self.telemetry.close()
+        if self.recorder:
+            self.recorder.save(self.record_path)
+            print(f"Replay written to {self.record_path}")
         pygame.quit()
         sys.exit()
 
 if __name__ == "__main__":
-    game = Game()
+    parser = argparse.ArgumentParser(description="Space Shooter")
+    parser.add_argument('--record', metavar='PATH', help="record this session's input for replay.py")
+    parser.add_argument('--renderer', choices=('software', 'sdl2'), default=RENDER_BACKEND,
+                        help="draw sprites with surface blits or SDL2 Renderer textures")
+    parser.add_argument('--telemetry', metavar='PATH', nargs='?', const='',
+                        help="write sampled session telemetry (default file: a new one in telemetry/)")
+    args = parser.parse_args()
+
+    telemetry_path = args.telemetry
+    if telemetry_path == '' or telemetry_path is None and TELEMETRY_ENABLED:
+        telemetry_path = session_path()
+    game = Game(record_path=args.record, renderer=args.renderer, telemetry_path=telemetry_path)
     game.run()
     game.quit()
@@ -0,0 +1,46 @@
+import pygame
+from settings import *
+
+class PooledSprite(pygame.sprite.Sprite):
+    """Sprite that returns itself to its pool when killed
+
+    Subclasses build their look once in ``__init__`` and put all per-spawn
+    state in ``reset``, which the pool calls when the instance is reused.
+    """
+    pool = None
+
+    def kill(self):
+        was_alive = self.alive()
+        super().kill()
+        if was_alive and self.pool is not None:
+            self.pool.release(self)
+
+class SpritePool:
+    """Free list of dead sprites of one kind, reused instead of reallocated
+
+    ``factory(groups, *args)`` builds a new sprite when the free list is
+    empty; otherwise a free sprite is re-added to ``groups`` and gets
+    ``reset(*args)``.
+    """
+    def __init__(self, factory, max_size=SPRITE_POOL_SIZE):
+        self.factory = factory
+        self.max_size = max_size
+        self.free = []
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, groups, *args):
+        if self.free:
+            sprite = self.free.pop()
+            sprite.reset(*args)
+            sprite.add(*groups)
+            self.reused += 1
+        else:
+            sprite = self.factory(groups, *args)
+            sprite.pool = self
+            self.created += 1
+        return sprite
+
+    def release(self, sprite):
+        if len(self.free) < self.max_size:
+            self.free.append(sprite)
@@ -0,0 +1,255 @@
+import weakref
+import pygame
+from settings import *
+from asset_manager import asset_manager
+from dirty_rects import dirty_rects
+
+try:
+    from pygame._sdl2 import video as sdl2_video
+except ImportError:
+    sdl2_video = None
+
+MOUSE_EVENTS = (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP)
+
+class Presenter:
+    """Shows a fixed-size logical frame in a window of any size
+
+    All game and UI drawing goes to ``surface``, which is always
+    SCREEN_WIDTH x SCREEN_HEIGHT. ``present`` copies it to the window: 1:1
+    (only the dirty regions) when the sizes match, otherwise with a single
+    scale straight into a letterboxed viewport. Switching fullscreen or
+    resizing the window only recomputes the viewport, so nothing drawn on
+    the logical surface has to be rebuilt.
+    """
+    backend = 'software'
+
+    def __init__(self, size=(SCREEN_WIDTH, SCREEN_HEIGHT)):
+        self.size = size
+        self.surface = None
+        self.window = None
+        self.fullscreen = False
+        self.viewport = pygame.Rect((0, 0), size)
+        self.target = None  # Window subsurface the frame is scaled into, None when 1:1
+
+    @property
+    def sprite_layer(self):
+        """Object GameManager hands its sprites to, or None to blit them onto ``surface``"""
+        return None
+
+    def set_mode(self, fullscreen=False):
+        """Open the window, or switch it between fullscreen and windowed"""
+        if fullscreen:
+            pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+        else:
+            pygame.display.set_mode(self.size, pygame.RESIZABLE)
+        self.fullscreen = fullscreen
+        if self.surface is None:
+            self.surface = pygame.Surface(self.size).convert()
+        self.resized()
+
+    def toggle_fullscreen(self):
+        self.set_mode(not self.fullscreen)
+
+    def close(self):
+        pass
+
+    def resized(self):
+        """Fit the viewport to the current window size"""
+        self.window = pygame.display.get_surface()
+        window_w, window_h = self.window.get_size()
+        w, h = self.size
+        scale = min(window_w / w, window_h / h)
+        viewport_w, viewport_h = max(1, round(w * scale)), max(1, round(h * scale))
+        self.viewport = pygame.Rect((window_w - viewport_w) // 2, (window_h - viewport_h) // 2,
+                                    viewport_w, viewport_h)
+        self.target = None if self.viewport.size == self.size else self.window.subsurface(self.viewport)
+        self.window.fill((0, 0, 0))
+        dirty_rects.invalidate()
+
+    def to_logical(self, pos):
+        """Window coordinates to logical surface coordinates"""
+        x, y = pos
+        return (int((x - self.viewport.x) * self.size[0] / self.viewport.width),
+                int((y - self.viewport.y) * self.size[1] / self.viewport.height))
+
+    def map_event(self, event):
+        """Mouse events with their positions in logical coordinates"""
+        if event.type not in MOUSE_EVENTS:
+            return event
+        attrs = dict(event.dict, pos=self.to_logical(event.pos))
+        if event.type == pygame.MOUSEMOTION:
+            attrs['rel'] = (int(event.rel[0] * self.size[0] / self.viewport.width),
+                            int(event.rel[1] * self.size[1] / self.viewport.height))
+        return pygame.event.Event(event.type, attrs)
+
+    def present(self):
+        rects = dirty_rects.take()
+        if self.target is not None:
+            pygame.transform.scale(self.surface, self.viewport.size, self.target)
+            pygame.display.update(self.viewport)
+        elif rects is None:
+            self.window.blit(self.surface, self.viewport)
+            pygame.display.flip()
+        elif rects:
+            offset = self.viewport.topleft
+            rects = [pygame.Rect(rect) for rect in rects]
+            self.window.blits([(self.surface, rect.move(offset), rect) for rect in rects], False)
+            pygame.display.update([rect.move(offset) for rect in rects])
+
+class TexturePresenter(Presenter):
+    """Presents through an SDL2 Renderer, drawing sprites as textures
+
+    The logical surface still receives everything except sprites. When
+    GameManager draws its star field and sprites it hands them to
+    ``draw_sprites`` instead: the plain background fill under them is
+    redrawn by the renderer, the surface is cleared to transparent for the
+    HUD and overlays, and the sprites are queued as renderer copies in
+    between. The overlay texture keeps its pixels from frame to frame, so
+    only the regions ``dirty_rects`` reports are uploaded to it. Frames
+    without sprites (menus) are uploaded whole as an opaque background.
+    Each asset and particle stamp is uploaded once; the scale, rotation
+    and flip that ``AssetManager.get_transformed`` would have baked in
+    are applied by the renderer. The renderer's logical size takes care
+    of letterboxing and of mapping mouse coordinates.
+    """
+    backend = 'sdl2'
+
+    def __init__(self, size=(SCREEN_WIDTH, SCREEN_HEIGHT), title="Space Shooter", accelerated=RENDERER_ACCELERATED):
+        super().__init__(size)
+        self.title = title
+        self.accelerated = accelerated
+        self.renderer = None
+        self.textures = {}  # Asset name -> Texture
+        self.surface_textures = weakref.WeakKeyDictionary()  # Other sprite images -> Texture
+        self.sprites = None  # Blits queued by draw_sprites this frame
+        self.overlay_stale = True  # Upload the whole overlay next time
+
+    @property
+    def sprite_layer(self):
+        return self
+
+    def set_mode(self, fullscreen=False):
+        if self.renderer is None:
+            # convert_alpha() needs a display mode even though nothing is drawn through it
+            if pygame.display.get_surface() is None:
+                pygame.display.set_mode((1, 1), pygame.HIDDEN)
+            self.window = sdl2_video.Window(self.title, size=self.size, resizable=True)
+            self.renderer = sdl2_video.Renderer(self.window, accelerated=self.accelerated)
+            self.renderer.logical_size = self.size
+            self.surface = pygame.Surface(self.size, pygame.SRCALPHA).convert_alpha()
+            self.bounds = self.surface.get_rect()
+            self.background = sdl2_video.Texture(self.renderer, self.size, streaming=True)
+            self.overlay = sdl2_video.Texture(self.renderer, self.size, streaming=True)
+            self.overlay.blend_mode = pygame.BLENDMODE_BLEND
+        if fullscreen:
+            self.window.set_fullscreen(True)
+        elif self.fullscreen:
+            self.window.set_windowed()
+        self.fullscreen = fullscreen
+        self.resized()
+
+    def close(self):
+        if self.window is not None:
+            self.window.destroy()
+        self.window = self.renderer = None
+
+    def resized(self):
+        dirty_rects.invalidate()
+
+    def map_event(self, event):
+        return event
+
+    def texture(self, image):
+        """Texture to draw ``image`` with and the transform to apply to it"""
+        source = asset_manager.transform_source(image)
+        if source is not None:
+            name, size, angle, flip = source
+            texture = self.textures.get(name)
+            if texture is None:
+                texture = self.textures[name] = sdl2_video.Texture.from_surface(
+                    self.renderer, asset_manager.get_image(name))
+                texture.blend_mode = pygame.BLENDMODE_BLEND
+            return texture, size or (texture.width, texture.height), angle, flip
+
+        texture = self.surface_textures.get(image)
+        if texture is None:
+            texture = self.surface_textures[image] = sdl2_video.Texture.from_surface(self.renderer, image)
+            texture.blend_mode = pygame.BLENDMODE_BLEND
+        return texture, image.get_size(), 0, (False, False)
+
+    def draw_sprites(self, blits):
+        """Take over drawing ``(image, (x, y))`` pairs over the plain UI_BG_DARK background"""
+        self.surface.fill((0, 0, 0, 0))
+        self.sprites = blits
+
+    def _prepare(self, image):
+        """Texture, size, offset from the blit position, alpha and draw arguments for ``image``"""
+        texture, (w, h), angle, (flip_x, flip_y) = self.texture(image)
+        # The image may be a rotated copy with a larger bounding box; both share a center
+        image_w, image_h = image.get_size()
+        dx, dy = image_w // 2 - w // 2, image_h // 2 - h // 2
+        alpha = image.get_alpha()
+        kwargs = {'flip_x': flip_x, 'flip_y': flip_y}
+        if angle:
+            # pygame rotates counterclockwise before flipping, SDL clockwise after
+            kwargs['angle'] = angle if flip_x != flip_y else -angle
+        return texture, w, h, dx, dy, 255 if alpha is None else alpha, kwargs
+
+    def _draw_queued_sprites(self):
+        # Many sprites share an image (star stamps above all), so each is looked up once a frame
+        prepared = {}
+        for image, (x, y) in self.sprites:
+            draw = prepared.get(image)
+            if draw is None:
+                draw = prepared[image] = self._prepare(image)
+            texture, w, h, dx, dy, alpha, kwargs = draw
+            texture.alpha = alpha
+            texture.draw(dstrect=(x + dx, y + dy, w, h), **kwargs)
+
+    def _update_overlay(self, rects):
+        """Upload the changed ``rects`` of the surface to the overlay, or all of it for None"""
+        if rects is None:
+            self.overlay.update(self.surface)
+            return
+        bounds = self.bounds
+        for rect in rects:
+            rect = bounds.clip(rect)
+            if rect.width and rect.height:
+                self.overlay.update(self.surface.subsurface(rect), rect)
+
+    def present(self):
+        rects = dirty_rects.take()
+        renderer = self.renderer
+        renderer.draw_color = (0, 0, 0, 255)
+        renderer.clear()
+        if self.sprites is None:
+            self.background.update(self.surface)
+            self.background.draw()
+            # The surface was drawn opaque, so the overlay no longer matches it anywhere
+            self.overlay_stale = True
+        else:
+            renderer.draw_color = (*UI_BG_DARK, 255)
+            renderer.fill_rect(self.bounds)
+            self._draw_queued_sprites()
+            self._update_overlay(None if self.overlay_stale else rects)
+            self.overlay_stale = False
+            self.overlay.draw()
+            self.sprites = None
+        renderer.present()
+
+def create_presenter(backend=RENDER_BACKEND, size=(SCREEN_WIDTH, SCREEN_HEIGHT), fullscreen=False):
+    """Open the window with the requested backend, falling back to software blits"""
+    if backend == 'sdl2':
+        if sdl2_video is None:
+            print("SDL2 renderer unavailable in this pygame build, using software rendering")
+        else:
+            presenter = TexturePresenter(size)
+            try:
+                presenter.set_mode(fullscreen)
+                return presenter
+            except (pygame.error, sdl2_video.error) as e:
+                print(f"SDL2 renderer unavailable ({e}), using software rendering")
+                presenter.close()
+    presenter = Presenter(size)
+    presenter.set_mode(fullscreen)
+    return presenter
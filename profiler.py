@@ -0,0 +1,156 @@
+import csv
+import json
+import os
+import time
+import numpy as np
+import pygame
+from settings import *
+from asset_manager import asset_manager
+
+# Instrumented phases, in display order
+PHASES = ('events', 'sprites_update', 'collisions', 'particles_update', 'particles_draw', 'hud', 'flip')
+
+class _NullSpan:
+    """Span handed out while profiling is disabled; does nothing"""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+class _Span:
+    """Accumulates wall time of one phase into the profiler's current frame"""
+    __slots__ = ('current', 'index', 'start')
+
+    def __init__(self, current, index):
+        self.current = current
+        self.index = index
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.current[self.index] += time.perf_counter() - self.start
+        return False
+
+class FrameProfiler:
+    """Per-phase frame timings kept in a fixed-size ring buffer
+
+    Wrap work in ``with profiler.span('phase'):``. While disabled, ``span``
+    returns a shared no-op context manager so instrumented code pays only
+    for the call.
+    """
+    def __init__(self, capacity=PROFILER_HISTORY):
+        self.enabled = False
+        self.capacity = capacity
+        # One row per frame: each phase in ms, then the whole frame
+        self.samples = np.zeros((capacity, len(PHASES) + 1))
+        self.index = 0
+        self.filled = 0
+        self.current = [0.0] * len(PHASES)
+        self.frame_start = None
+        self._spans = {name: _Span(self.current, i) for i, name in enumerate(PHASES)}
+
+    def span(self, name):
+        if not self.enabled:
+            return _NULL_SPAN
+        return self._spans[name]
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.frame_start = None
+
+    def begin_frame(self):
+        if self.enabled:
+            for i in range(len(self.current)):
+                self.current[i] = 0.0
+            self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        if not self.enabled or self.frame_start is None:
+            return
+        row = self.samples[self.index]
+        row[:-1] = self.current
+        row[-1] = time.perf_counter() - self.frame_start
+        row *= 1000
+        self.index = (self.index + 1) % self.capacity
+        self.filled = min(self.filled + 1, self.capacity)
+
+    def history(self):
+        """Recorded rows, oldest first"""
+        if self.filled < self.capacity:
+            return self.samples[:self.filled]
+        return np.roll(self.samples, -self.index, axis=0)
+
+    def summary(self):
+        """Mean ms per phase (plus 'frame') over the recorded history"""
+        history = self.history()
+        if not len(history):
+            return {}
+        means = history.mean(axis=0)
+        return dict(zip(PHASES + ('frame',), means.tolist()))
+
+    def dump(self, directory=PROFILE_DIR):
+        """Write the history to timestamped CSV and JSON files and return their paths"""
+        os.makedirs(directory, exist_ok=True)
+        stem = os.path.join(directory, time.strftime('profile_%Y%m%d_%H%M%S'))
+        columns = PHASES + ('frame',)
+        history = self.history().tolist()
+
+        with open(stem + '.csv', 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            writer.writerows(history)
+
+        with open(stem + '.json', 'w') as f:
+            json.dump({
+                'units': 'ms',
+                'summary': self.summary(),
+                'frames': [dict(zip(columns, row)) for row in history],
+            }, f)
+
+        return stem + '.csv', stem + '.json'
+
+class ProfilerOverlay:
+    """Frame-time graph and per-phase breakdown drawn over the game"""
+    def __init__(self, width=320, graph_height=80):
+        self.width = width
+        self.graph_height = graph_height
+        self.font = None
+
+    def draw(self, surface, profiler):
+        if self.font is None:
+            self.font = asset_manager.get_font(14)
+
+        line_height = 16
+        height = self.graph_height + line_height * (len(PHASES) + 2) + 10
+        panel = pygame.Surface((self.width, height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+
+        # Frame-time graph, scaled so the top edge is two frame budgets
+        budget = 1000 / FPS
+        scale = self.graph_height / (budget * 2)
+        frames = profiler.history()[-self.width:, -1]
+        base = self.graph_height
+        for x, ms in enumerate(frames.tolist()):
+            color = UI_SUCCESS if ms <= budget else UI_DANGER
+            pygame.draw.line(panel, color, (x, base), (x, base - min(base, int(ms * scale))))
+        budget_y = base - int(budget * scale)
+        pygame.draw.line(panel, UI_ACCENT, (0, budget_y), (self.width, budget_y))
+
+        # Per-phase breakdown
+        summary = profiler.summary()
+        y = base + 5
+        for name in PHASES + ('frame',):
+            text = f"{name:<18}{summary.get(name, 0.0):7.3f} ms"
+            panel.blit(self.font.render(text, True, UI_TEXT), (5, y))
+            y += line_height
+        panel.blit(self.font.render("F3: hide   F4: dump CSV/JSON", True, UI_TEXT_DIM), (5, y))
+
+        surface.blit(panel, (10, SCREEN_HEIGHT - height - 10))
+
+profiler = FrameProfiler()
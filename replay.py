@@ -0,0 +1,213 @@
+import os
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import argparse
+import gzip
+import json
+import time
+import pygame
+from settings import *
+from game_random import game_random
+
+REPLAY_VERSION = 1
+
+# Keys Player.input reads from the pressed-key state
+RECORDED_KEYS = (
+    pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN,
+    pygame.K_a, pygame.K_d, pygame.K_w, pygame.K_s,
+    pygame.K_SPACE,
+)
+
+# Events GameManager.handle_event reacts to; window events don't affect
+# the simulation
+RECORDED_EVENTS = (
+    pygame.KEYDOWN, pygame.KEYUP,
+    pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP,
+)
+
+class KeyState:
+    """Pressed-key snapshot indexable like ``pygame.key.get_pressed()``"""
+    def __init__(self, mask=0):
+        self.mask = mask
+
+    @classmethod
+    def from_keys(cls, keys):
+        """State with only ``keys`` (a subset of RECORDED_KEYS) held"""
+        return cls(sum(1 << RECORDED_KEYS.index(key) for key in set(keys)))
+
+    def __getitem__(self, key):
+        try:
+            return bool(self.mask >> RECORDED_KEYS.index(key) & 1)
+        except ValueError:
+            return False
+
+def key_mask(pressed):
+    """Bitmask of the RECORDED_KEYS held in a get_pressed() result"""
+    mask = 0
+    for bit, key in enumerate(RECORDED_KEYS):
+        if pressed[key]:
+            mask |= 1 << bit
+    return mask
+
+def encode_event(event):
+    """JSON-safe copy of an event's attributes"""
+    attrs = {}
+    for name, value in event.dict.items():
+        if isinstance(value, (bool, int, float, str)):
+            attrs[name] = value
+        elif isinstance(value, tuple):
+            attrs[name] = list(value)
+    return attrs
+
+def decode_event(event_type, attrs):
+    attrs = {name: tuple(value) if isinstance(value, list) else value for name, value in attrs.items()}
+    return pygame.event.Event(event_type, attrs)
+
+class ReplayRecorder:
+    """Records the inputs of a session, one simulation tick at a time
+
+    Call ``begin_tick`` before every simulation tick and ``record_event``
+    for every event handed to ``GameManager.handle_event``; set
+    ``key_state`` as the GameManager's key source. Key states are stored
+    run-length encoded and the file is gzipped JSON.
+    """
+    def __init__(self, seed, sim_rate=SIM_RATE):
+        self.seed = seed
+        self.sim_rate = sim_rate
+        self.ticks = 0
+        self.key_runs = []  # [mask, tick count]
+        self.events = []  # [tick, type, attributes]
+        self.keys = KeyState()
+
+    def begin_tick(self):
+        """Sample the keyboard for the tick about to run; returns no events"""
+        mask = key_mask(pygame.key.get_pressed())
+        if self.key_runs and self.key_runs[-1][0] == mask:
+            self.key_runs[-1][1] += 1
+        else:
+            self.key_runs.append([mask, 1])
+        self.keys = KeyState(mask)
+        self.ticks += 1
+        return ()
+
+    def key_state(self):
+        return self.keys
+
+    def record_event(self, event):
+        """Record an event applied before the next tick"""
+        if event.type in RECORDED_EVENTS:
+            self.events.append([self.ticks, event.type, encode_event(event)])
+
+    def save(self, path):
+        data = {
+            'version': REPLAY_VERSION,
+            'seed': self.seed,
+            'sim_rate': self.sim_rate,
+            'ticks': self.ticks,
+            'keys': list(RECORDED_KEYS),
+            'key_runs': self.key_runs,
+            'events': self.events,
+        }
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with gzip.open(path, 'wt') as f:
+            json.dump(data, f, separators=(',', ':'))
+
+class ReplayPlayer:
+    """Feeds a recorded session back in, one simulation tick at a time
+
+    Mirrors ``ReplayRecorder``: ``begin_tick`` returns the events recorded
+    before that tick and switches ``key_state`` to its recorded keys.
+    """
+    def __init__(self, path):
+        with gzip.open(path, 'rt') as f:
+            data = json.load(f)
+        if data.get('version') != REPLAY_VERSION:
+            raise ValueError(f"{path}: unsupported replay version {data.get('version')}")
+        if tuple(data['keys']) != RECORDED_KEYS:
+            raise ValueError(f"{path}: recorded with a different key layout")
+
+        self.seed = data['seed']
+        self.sim_rate = data['sim_rate']
+        self.length = data['ticks']
+        self.key_runs = data['key_runs']
+        self.events = data['events']
+        self.tick = 0
+        self.run_index = 0
+        self.run_left = self.key_runs[0][1] if self.key_runs else 0
+        self.event_index = 0
+        self.keys = KeyState()
+
+    @property
+    def finished(self):
+        return self.tick >= self.length
+
+    def begin_tick(self):
+        """Recorded events due before the next tick, in their original order"""
+        events = []
+        while self.event_index < len(self.events) and self.events[self.event_index][0] <= self.tick:
+            _, event_type, attrs = self.events[self.event_index]
+            events.append(decode_event(event_type, attrs))
+            self.event_index += 1
+
+        if self.run_left == 0 and self.run_index + 1 < len(self.key_runs):
+            self.run_index += 1
+            self.run_left = self.key_runs[self.run_index][1]
+        if self.run_left:
+            self.keys = KeyState(self.key_runs[self.run_index][0])
+            self.run_left -= 1
+
+        self.tick += 1
+        return events
+
+    def key_state(self):
+        return self.keys
+
+def play_headless(path):
+    """Re-drive a recorded session as fast as possible with rendering off"""
+    from headless import HeadlessRunner  # Selects the dummy SDL drivers
+
+    replay = ReplayPlayer(path)
+    game_random.seed(replay.seed)
+    runner = HeadlessRunner(replay.sim_rate)
+    gm = runner.game_manager
+    gm.key_source = replay.key_state
+    quit_requested = []
+    gm.quit_callback = lambda: quit_requested.append(True)
+
+    start = time.perf_counter()
+    while not replay.finished and not quit_requested:
+        for event in replay.begin_tick():
+            gm.handle_event(event)
+        runner.step()
+    wall = time.perf_counter() - start
+
+    return {
+        'state': gm.game_state,
+        'mode': gm.game_mode,
+        'score': gm.player.score if gm.player else 0,
+        'ticks': runner.ticks,
+        'sim_seconds': runner.ticks / replay.sim_rate,
+        'wall_seconds': wall,
+        'ticks_per_second': runner.ticks / wall if wall > 0 else float('inf'),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Play back a recorded Space Shooter session")
+    parser.add_argument('path', help="replay file written by main.py --record")
+    parser.add_argument('--realtime', action='store_true', help="play in a window at normal speed")
+    args = parser.parse_args()
+
+    if args.realtime:
+        from main import Game
+        game = Game(replay=ReplayPlayer(args.path))
+        game.run()
+        game.quit()
+    else:
+        print(json.dumps(play_headless(args.path)))
+        pygame.quit()
+
+if __name__ == "__main__":
+    main()
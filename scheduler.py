@@ -0,0 +1,62 @@
+import heapq
+
+class Scheduler:
+    """Min-heap of named, optionally repeating callbacks on simulation time
+
+    Time only moves when the owner calls ``advance``, so anything scheduled
+    here pauses with the simulation and runs as fast as it is stepped.
+    Scheduling a name again replaces its previous entry; stale heap entries
+    are skipped when popped rather than removed.
+    """
+    def __init__(self):
+        self.time = 0.0
+        self.heap = []  # [due, seq, entry]
+        self.entries = {}  # name -> entry
+        self.seq = 0
+
+    def schedule(self, name, interval, callback, count=0, delay=None):
+        """Call ``callback`` every ``interval`` ms, ``count`` times (0 = until cancelled)
+
+        The first call happens after ``delay`` ms, by default one interval.
+        A non-positive interval just cancels ``name``.
+        """
+        self.cancel(name)
+        if interval <= 0:
+            return
+        entry = {'name': name, 'interval': interval, 'callback': callback, 'left': count}
+        self.entries[name] = entry
+        self._push(self.time + (interval if delay is None else delay), entry)
+
+    def _push(self, due, entry):
+        self.seq += 1
+        heapq.heappush(self.heap, (due, self.seq, entry))
+
+    def cancel(self, name):
+        self.entries.pop(name, None)
+
+    def clear(self):
+        """Drop every entry and restart time at zero"""
+        self.time = 0.0
+        self.heap.clear()
+        self.entries.clear()
+
+    def advance(self, millis):
+        """Move time forward, running due callbacks in time order"""
+        end = self.time + millis
+        heap = self.heap
+        while heap and heap[0][0] <= end:
+            due, _, entry = heapq.heappop(heap)
+            if self.entries.get(entry['name']) is not entry:
+                continue  # Cancelled or replaced
+            self.time = due
+            if entry['left'] == 1:
+                del self.entries[entry['name']]
+            else:
+                if entry['left']:
+                    entry['left'] -= 1
+                self._push(due + entry['interval'], entry)
+            entry['callback']()
+        self.time = end
+
+    def pending(self, name):
+        return name in self.entries
@@ -4,8 +4,17 @@ import os
 # Screen dimensions
 SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
-FPS = 60
+FPS = 60  # Render frame cap; can exceed SIM_RATE (e.g. 120/144)
+SIM_RATE = 60  # Fixed simulation ticks per second
+SIM_DT = 1 / SIM_RATE
+MAX_FRAME_TIME = 0.25  # Longest frame the simulation will catch up on (s)
+TUNING_FPS = 60  # Frame rate the per-frame speed constants below were tuned at
 FULLSCREEN = False  # Toggle fullscreen mode
+DIRTY_RECTS = False  # Present only changed screen regions instead of flipping every frame (F5 toggles)
+DIRTY_RECT_LIMIT = 256  # Fall back to a full flip above this many regions
+DIRTY_TILE_SIZE = 32  # Particles are reported as dirty tiles of this size
+RENDER_BACKEND = 'software'  # 'software' blits surfaces; 'sdl2' draws sprites as SDL Renderer textures
+RENDERER_ACCELERATED = -1  # SDL2 backend: -1 any renderer, 0 software only, 1 GPU only
 
 # Colors
 WHITE = (255, 255, 255)
@@ -37,6 +46,13 @@ SPRITES_DIR = os.path.join(BASE_DIR, 'Sprites')
 AUDIO_DIR = os.path.join(BASE_DIR, 'Audio')
 BG_MUSIC_PATH = os.path.join(AUDIO_DIR, 'bg_music.mp3')
 COLLISION_SOUND_PATH = os.path.join(AUDIO_DIR, 'collision.mp3')
+PROFILE_DIR = os.path.join(BASE_DIR, 'profiles')
+TELEMETRY_DIR = os.path.join(BASE_DIR, 'telemetry')
+MANIFEST_PATH = os.path.join(BASE_DIR, 'sprites_manifest.json')
+ATLAS_DIR = os.path.join(BASE_DIR, 'atlas_cache')
+ATLAS_BLOB_PATH = os.path.join(ATLAS_DIR, 'atlas.rgba')
+ATLAS_INDEX_PATH = os.path.join(ATLAS_DIR, 'atlas_index.json')
+AUDIO_CACHE_DIR = os.path.join(BASE_DIR, 'audio_cache')
 
 # Game Settings
 PLAYER_SPEED = 5
@@ -45,6 +61,27 @@ ENEMY_SPEED_MIN = 2
 ENEMY_SPEED_MAX = 5
 METEOR_SPEED_MIN = 1
 METEOR_SPEED_MAX = 4
+ENEMY_SPAWN_INTERVAL = 1500  # Endless mode, ms
+METEOR_SPAWN_INTERVAL = 2000  # Endless mode, ms
+STORY_METEOR_INTERVAL = 3000  # Story waves with meteors, ms
+SPATIAL_HASH_CELL_SIZE = 64  # Broadphase grid cell size in pixels
+PIXEL_COLLISIONS = True  # Mask-test rect hits so transparent corners don't collide
+SPRITE_POOL_SIZE = 256  # Max dead sprites kept per pool for reuse
+TRANSFORM_CACHE_BYTES = 32 * 1024 * 1024  # Memory budget for cached scaled/rotated images
+ATLAS_SIZE = 2048  # Max width/height of a packed sprite atlas
+TEXT_CACHE_SIZE = 256  # Rendered text surfaces kept in the LRU cache
+GRADIENT_CACHE_SIZE = 64  # Stretched gradient surfaces kept in the LRU cache
+GRADIENT_STRIP_LENGTH = 256  # Pixels in each color pair's strip; one step per 8-bit level
+ASSET_LOAD_WORKERS = None  # Image decoding threads at startup; None means one per CPU core
+LOADING_CONVERT_BUDGET_MS = 8  # Main-thread time per loading-screen frame for converting decoded images
+
+# Audio Settings
+AUDIO_FREQUENCY = 44100
+AUDIO_BUFFER = 512  # Mixer buffer in samples; smaller means lower play latency
+AUDIO_MIXER_CHANNELS = 16
+AUDIO_RESERVED_CHANNELS = 8  # Channels kept for AudioManager sound effects
+SOUND_VOICE_LIMIT = 3  # Default max simultaneous voices of one sound
+SOUND_RETRIGGER_MS = 40  # Default min time between two plays of one sound
 
 # UI Animation Settings
 BUTTON_HOVER_SCALE = 1.1
@@ -57,3 +94,14 @@ SCORE_POPUP_DURATION = 1.0  # seconds
 SCREEN_SHAKE_TRAUMA = 0.3  # Amount of trauma for collisions
 PARTICLE_COUNT_EXPLOSION = 20
 PARTICLE_COUNT_STARS = 150
+PARTICLE_ALPHA_LEVELS = 32  # Alpha quantization steps for cached particle stamps
+
+# Profiling
+PROFILER_HISTORY = 240  # Frames kept in the timing ring buffer
+
+# Telemetry
+TELEMETRY_ENABLED = False  # Write a per-session stream to TELEMETRY_DIR (also main.py --telemetry)
+TELEMETRY_SAMPLE_HZ = 4  # Records per second of real time
+TELEMETRY_BUFFER = 1024  # Records queued for the writer thread before new ones are dropped
+TELEMETRY_MAX_BYTES = 1024 * 1024  # Rotate the file past this size
+TELEMETRY_BACKUPS = 3  # Rotated files kept
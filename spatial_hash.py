@@ -0,0 +1,82 @@
+from settings import *
+
+class SpatialHash:
+    """Uniform grid broadphase over the rects of a sprite group
+
+    The grid is rebuilt from a group once per tick with ``build``. Queries
+    only test sprites sharing a cell with the query rect, and return them in
+    the group's own iteration order so results match ``pygame.sprite``'s
+    brute-force helpers exactly.
+    """
+    def __init__(self, cell_size=SPATIAL_HASH_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.order = {}
+        self.group = None
+
+    def _cell_range(self, rect):
+        """Cells covered by a rect as (x0, x1, y0, y1), inclusive"""
+        cs = self.cell_size
+        return (rect.left // cs, (rect.right - 1) // cs,
+                rect.top // cs, (rect.bottom - 1) // cs)
+
+    def build(self, group):
+        """Rebuild the grid from the current rects of a group"""
+        self.cells.clear()
+        self.order.clear()
+        self.group = group
+        cells = self.cells
+
+        for index, sprite in enumerate(group.sprites()):
+            self.order[sprite] = index
+            x0, x1, y0, y1 = self._cell_range(sprite.rect)
+            for cx in range(x0, x1 + 1):
+                for cy in range(y0, y1 + 1):
+                    bucket = cells.get((cx, cy))
+                    if bucket is None:
+                        cells[(cx, cy)] = [sprite]
+                    else:
+                        bucket.append(sprite)
+
+    def query(self, rect):
+        """Sprites still in the group whose rect collides with ``rect``"""
+        cells = self.cells
+        group = self.group
+        x0, x1, y0, y1 = self._cell_range(rect)
+
+        found = set()
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+
+        hits = [s for s in found if s in group and rect.colliderect(s.rect)]
+        if len(hits) > 1:
+            hits.sort(key=self.order.__getitem__)
+        return hits
+
+    def spritecollide(self, sprite, dokill, collided=None):
+        """Grid-backed equivalent of ``pygame.sprite.spritecollide``
+
+        ``collided(sprite, other)`` (e.g. ``pygame.sprite.collide_mask``)
+        refines the rect hits found in the grid.
+        """
+        hits = self.query(sprite.rect)
+        if collided is not None and hits:
+            hits = [hit for hit in hits if collided(sprite, hit)]
+        if dokill:
+            for hit in hits:
+                hit.kill()
+        return hits
+
+    def groupcollide(self, groupa, dokilla, dokillb, collided=None):
+        """Grid-backed equivalent of ``pygame.sprite.groupcollide(groupa, self.group)``"""
+        crashed = {}
+        for sprite in groupa.sprites():
+            collision = self.spritecollide(sprite, dokillb, collided)
+            if collision:
+                crashed[sprite] = collision
+                if dokilla:
+                    sprite.kill()
+        return crashed
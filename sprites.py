@@ -1,25 +1,42 @@
 
 import pygame
-import random
-import math
 from settings import *
 from asset_manager import asset_manager
+from game_clock import game_clock
+from game_random import rng
+from pool import PooledSprite
+from entities import EntitySprite, ENTITY_TYPE_IDS
+
+def sprite_mask(image, name, size=None, angle=0):
+    """Cached mask for an asset variant, or a mask of the fallback surface"""
+    mask = asset_manager.get_mask(name, size, angle)
+    return mask if mask is not None else pygame.mask.from_surface(image)
+
+# Every image the sprites below can use, preloaded before gameplay starts
+GAMEPLAY_ASSETS = [
+    'ships_spaceships_001_png', 'ships_spaceships_004_png', 'ships_spaceships_006_png',
+    'ships_spaceships_007_png', 'ships_spaceships_008_png',
+    'missiles_spacemissiles_001_png', 'missiles_spacemissiles_004_png', 'missiles_spacemissiles_016_png',
+    'meteors_spacemeteors_001_png', 'meteors_spacemeteors_002_png',
+    'meteors_spacemeteors_003_png', 'meteors_spacemeteors_004_png',
+    'parts_spaceparts_052_png', 'parts_spaceparts_055_png', 'parts_spaceparts_057_png',
+    'parts_spaceparts_066_png', 'parts_spaceparts_072_png',
+    'parts_spaceparts_086_png', 'parts_spaceparts_088_png', 'parts_spaceparts_091_png',
+    'effects_spaceeffects_010_png',
+]
 
 class Player(pygame.sprite.Sprite):
     def __init__(self, groups):
         super().__init__(groups)
         # Choosing a blue ship
-        self.original_image = asset_manager.get_image('ships_spaceships_001_png')
-        if not self.original_image:
-             # Fallback if image not found, create a placeholder
-            self.original_image = pygame.Surface((50, 40))
-            self.original_image.fill(BLUE)
-        
-        # Rotate if necessary (sprites might be facing up or down)
         # Assuming sprites face up by default. If they face right, rotate -90.
-        # Let's assume standard up-facing for now.
+        self.image = asset_manager.get_transformed('ships_spaceships_001_png', (50, 40)) # Scale down a bit
+        if not self.image:
+             # Fallback if image not found, create a placeholder
+            self.image = pygame.Surface((50, 40))
+            self.image.fill(BLUE)
+        self.mask = sprite_mask(self.image, 'ships_spaceships_001_png', (50, 40))
         
-        self.image = pygame.transform.scale(self.original_image, (50, 40)) # Scale down a bit
         self.rect = self.image.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 100))
         
         self.direction = pygame.math.Vector2()
@@ -47,9 +64,12 @@ class Player(pygame.sprite.Sprite):
         # Bullets tracking for story mode
         self.bullets_fired = 0
         self.bullets_remaining = -1  # -1 means unlimited
+        
+        # Callable returning the pressed-key state; swapped out by headless bots
+        self.key_source = pygame.key.get_pressed
 
     def input(self):
-        keys = pygame.key.get_pressed()
+        keys = self.key_source()
         
         # Handle reverse controls debuff
         if self.reverse_controls:
@@ -67,8 +87,8 @@ class Player(pygame.sprite.Sprite):
         if keys[pygame.K_SPACE]:
             self.shoot()
 
-    def move(self):
-        self.rect.center += self.direction * self.speed
+    def move(self, dt=SIM_DT):
+        self.rect.center += self.direction * self.speed * (dt * TUNING_FPS)
         
         # Constrain to screen
         if self.rect.left < 0:
@@ -81,7 +101,7 @@ class Player(pygame.sprite.Sprite):
             self.rect.bottom = SCREEN_HEIGHT
 
     def shoot(self):
-        current_time = pygame.time.get_ticks()
+        current_time = game_clock.get_ticks()
         
         # Check bullet limit for story mode
         if self.bullets_remaining == 0:
@@ -98,7 +118,7 @@ class Player(pygame.sprite.Sprite):
     
     def apply_powerup(self, power_type):
         """Apply power-up effect"""
-        current_time = pygame.time.get_ticks()
+        current_time = game_clock.get_ticks()
         
         if power_type == 'health':
             self.health = min(self.health + 30, self.max_health)
@@ -115,7 +135,7 @@ class Player(pygame.sprite.Sprite):
     
     def apply_powerdown(self, debuff_type):
         """Apply power-down effect"""
-        current_time = pygame.time.get_ticks()
+        current_time = game_clock.get_ticks()
         
         if debuff_type == 'slow':
             self.speed = self.base_speed * 0.5
@@ -127,7 +147,7 @@ class Player(pygame.sprite.Sprite):
     
     def update_powerup_timers(self):
         """Update power-up timers and reset effects"""
-        current_time = pygame.time.get_ticks()
+        current_time = game_clock.get_ticks()
         
         # Invincibility
         if self.invincible and current_time - self.invincible_timer > self.invincible_duration:
@@ -141,187 +161,178 @@ class Player(pygame.sprite.Sprite):
         if self.reverse_controls and current_time - self.reverse_timer > self.reverse_duration:
             self.reverse_controls = False
 
-    def update(self):
+    def update(self, dt=SIM_DT):
         self.input()
-        self.move()
+        self.move(dt)
         self.update_powerup_timers()
 
-class Bullet(pygame.sprite.Sprite):
+class Bullet(PooledSprite):
     def __init__(self, pos, groups, is_player=True):
         super().__init__(groups)
         self.is_player = is_player
         
         img_name = 'missiles_spacemissiles_001_png' if is_player else 'missiles_spacemissiles_004_png'
-        self.original_image = asset_manager.get_image(img_name)
-        if not self.original_image:
-            self.original_image = pygame.Surface((10, 20))
-            self.original_image.fill(YELLOW if is_player else RED)
-
-        self.image = pygame.transform.scale(self.original_image, (10, 20))
-        # Flip collision rect?
-        if not is_player:
-            self.image = pygame.transform.rotate(self.image, 180)
+        # Enemy bullets are turned around to point down
+        self.image = asset_manager.get_transformed(img_name, (10, 20), 0 if is_player else 180)
+        if not self.image:
+            self.image = pygame.Surface((10, 20))
+            self.image.fill(YELLOW if is_player else RED)
+        self.mask = sprite_mask(self.image, img_name, (10, 20), 0 if is_player else 180)
 
-        self.rect = self.image.get_rect(center=pos)
         self.speed = BULLET_SPEED if is_player else -BULLET_SPEED # Wait, enemy bullets go DOWN (+y)
         self.direction = -1 if is_player else 1
+        self.reset(pos)
 
-    def update(self):
-        self.rect.y += self.direction * self.speed
+    def reset(self, pos):
+        self.rect = self.image.get_rect(center=pos)
+
+    def update(self, dt=SIM_DT):
+        self.rect.y += self.direction * self.speed * (dt * TUNING_FPS)
         
         # Remove if off screen
         if self.rect.bottom < 0 or self.rect.top > SCREEN_HEIGHT:
             self.kill()
 
-class Enemy(pygame.sprite.Sprite):
+class Enemy(EntitySprite):
     def __init__(self, groups, enemy_type='basic'):
-        super().__init__(groups)
+        super().__init__()
         self.enemy_type = enemy_type
+        self.entity_type = enemy_type if enemy_type in ENTITY_TYPE_IDS else 'basic'
         
         # Select image based on type
         if enemy_type == 'basic':
             img_name = 'ships_spaceships_004_png' # A reddish ship maybe
-            self.speed = random.uniform(ENEMY_SPEED_MIN, ENEMY_SPEED_MAX)
-            self.health = 1
         elif enemy_type == 'tank':
             img_name = 'ships_spaceships_008_png' # A bigger ship
-            self.speed = ENEMY_SPEED_MIN
-            self.health = 3
         elif enemy_type == 'fast':
             img_name = 'ships_spaceships_006_png'
+        else:
+            img_name = 'ships_spaceships_004_png'
+
+        self.image = asset_manager.get_transformed(img_name, (50, 50), 180) # Face down
+        if not self.image:
+            self.image = pygame.Surface((50, 50))
+            self.image.fill(RED)
+        self.mask = sprite_mask(self.image, img_name, (50, 50), 180)
+        self.reset()
+        self.add(groups)
+
+    def reset(self):
+        if self.enemy_type == 'basic':
+            self.speed = rng.uniform(ENEMY_SPEED_MIN, ENEMY_SPEED_MAX)
+            self.health = 1
+        elif self.enemy_type == 'tank':
+            self.speed = ENEMY_SPEED_MIN
+            self.health = 3
+        elif self.enemy_type == 'fast':
             self.speed = ENEMY_SPEED_MAX + 2
             self.health = 1
         else:
-            img_name = 'ships_spaceships_004_png'
             self.speed = ENEMY_SPEED_MIN
             self.health = 1
-
-        self.original_image = asset_manager.get_image(img_name)
-        if not self.original_image:
-            self.original_image = pygame.Surface((40, 40))
-            self.original_image.fill(RED)
-            
-        self.image = pygame.transform.scale(self.original_image, (50, 50))
-        self.image = pygame.transform.rotate(self.image, 180) # Face down
         
         # Random x position
-        x_pos = random.randint(50, SCREEN_WIDTH - 50)
+        x_pos = rng.randint(50, SCREEN_WIDTH - 50)
         self.rect = self.image.get_rect(midbottom=(x_pos, 0))
+        self.velocity = (0, self.speed)
 
-    def update(self):
-        self.rect.y += self.speed
-        if self.rect.top > SCREEN_HEIGHT:
-            self.kill()
+class Meteor(EntitySprite):
+    entity_type = 'meteor'
 
-class Meteor(pygame.sprite.Sprite):
     def __init__(self, groups):
-        super().__init__(groups)
-        
+        super().__init__()
+        self.reset()
+        self.add(groups)
+
+    def reset(self):
         # Random meteor
-        meteor_idx = random.randint(1, 4)
+        meteor_idx = rng.randint(1, 4)
         img_name = f'meteors_spacemeteors_00{meteor_idx}_png'
-        self.original_image = asset_manager.get_image(img_name)
+        scale = rng.randint(30, 80)
+        self.image = asset_manager.get_transformed(img_name, (scale, scale))
         
-        if not self.original_image:
-             self.original_image = pygame.Surface((40, 40))
-             self.original_image.fill((100, 100, 100))
+        if not self.image:
+             self.image = pygame.Surface((scale, scale))
+             self.image.fill((100, 100, 100))
+        self.mask = sprite_mask(self.image, img_name, (scale, scale))
 
-        scale = random.randint(30, 80)
-        self.image = pygame.transform.scale(self.original_image, (scale, scale))
-        self.rect = self.image.get_rect(center=(random.randint(50, SCREEN_WIDTH-50), -50))
+        self.rect = self.image.get_rect(center=(rng.randint(50, SCREEN_WIDTH-50), -50))
         
-        self.speed_y = random.uniform(METEOR_SPEED_MIN, METEOR_SPEED_MAX)
-        self.speed_x = random.uniform(-1, 1)
-        self.rot_speed = random.uniform(-2, 2)
+        self.speed_y = rng.uniform(METEOR_SPEED_MIN, METEOR_SPEED_MAX)
+        self.speed_x = rng.uniform(-1, 1)
+        self.rot_speed = rng.uniform(-2, 2)
         self.rotation = 0
+        self.health = 1
+        self.velocity = (self.speed_x, self.speed_y)
 
-    def update(self):
-        self.rect.y += self.speed_y
-        self.rect.x += self.speed_x
-        
-        # Simple rotation (might be expensive effectively, but okay for PC)
-        # self.rotation += self.rot_speed
-        # self.image = pygame.transform.rotate(self.original_image, self.rotation)
-        # self.rect = self.image.get_rect(center=self.rect.center)
-        # Rotation with pygame sprite rects is tricky (jitter), skipping for stable MVP first
-        
-        if self.rect.top > SCREEN_HEIGHT:
-            self.kill()
-
-class EnemyShooter(pygame.sprite.Sprite):
+class EnemyShooter(EntitySprite):
     def __init__(self, groups, enemy_type='shooter'):
-        super().__init__(groups)
+        super().__init__()
         self.enemy_type = enemy_type
+        self.entity_type = 'shooter'
         
         img_name = 'ships_spaceships_007_png'
-        self.speed = random.uniform(1.5, 3.0)
+        self.image = asset_manager.get_transformed(img_name, (50, 50), 180)
+        if not self.image:
+            self.image = pygame.Surface((50, 50))
+            self.image.fill(RED)
+        self.mask = sprite_mask(self.image, img_name, (50, 50), 180)
+        self.create_bullet_callback = None
+        self.reset()
+        self.add(groups)
+
+    def reset(self):
+        self.speed = rng.uniform(1.5, 3.0)
         self.health = 2
         
-        self.original_image = asset_manager.get_image(img_name)
-        if not self.original_image:
-            self.original_image = pygame.Surface((40, 40))
-            self.original_image.fill(RED)
-            
-        self.image = pygame.transform.scale(self.original_image, (50, 50))
-        self.image = pygame.transform.rotate(self.image, 180)
-        
-        x_pos = random.randint(50, SCREEN_WIDTH - 50)
+        x_pos = rng.randint(50, SCREEN_WIDTH - 50)
         self.rect = self.image.get_rect(midbottom=(x_pos, 0))
         
         self.last_shot_time = 0
-        self.shoot_delay = random.randint(1500, 3000)
-        self.create_bullet_callback = None
-        self.move_pattern = random.choice(['straight', 'zigzag'])
-        self.direction = random.choice([-1, 1])
-        
-    def shoot(self):
-        current_time = pygame.time.get_ticks()
-        if current_time - self.last_shot_time > self.shoot_delay:
-            if self.create_bullet_callback:
-                self.create_bullet_callback(self.rect.centerx, self.rect.bottom)
-                self.last_shot_time = current_time
-                self.shoot_delay = random.randint(1500, 3000)
-    
-    def update(self):
-        self.rect.y += self.speed
-        
-        if self.move_pattern == 'zigzag':
-            self.rect.x += self.direction * 2
-            if self.rect.left < 0 or self.rect.right > SCREEN_WIDTH:
-                self.direction *= -1
-        
-        self.shoot()
-        
-        if self.rect.top > SCREEN_HEIGHT:
-            self.kill()
+        self.shoot_delay = rng.randint(1500, 3000)
+        self.move_pattern = rng.choice(['straight', 'zigzag'])
+        self.direction = rng.choice([-1, 1])
+        
+        self.bounce = self.move_pattern == 'zigzag'
+        self.velocity = (self.direction * 2 if self.bounce else 0, self.speed)
+        self.fire_at = self.last_shot_time + self.shoot_delay
+        
+    def fire(self, now):
+        if not self.create_bullet_callback:
+            return now  # Try again next tick
+        self.create_bullet_callback(self.rect.centerx, self.rect.bottom)
+        self.last_shot_time = now
+        self.shoot_delay = rng.randint(1500, 3000)
+        return now + self.shoot_delay
+
+class EnemyRocket(EntitySprite):
+    entity_type = 'rocket'
 
-class EnemyRocket(pygame.sprite.Sprite):
     def __init__(self, groups):
-        super().__init__(groups)
+        super().__init__()
         
         img_name = 'missiles_spacemissiles_016_png'
-        self.original_image = asset_manager.get_image(img_name)
-        if not self.original_image:
-            self.original_image = pygame.Surface((30, 60))
-            self.original_image.fill((200, 50, 50))
-            
-        self.image = pygame.transform.scale(self.original_image, (40, 70))
-        self.image = pygame.transform.rotate(self.image, 180)
-        
-        x_pos = random.randint(50, SCREEN_WIDTH - 50)
+        self.image = asset_manager.get_transformed(img_name, (40, 70), 180)
+        if not self.image:
+            self.image = pygame.Surface((40, 70))
+            self.image.fill((200, 50, 50))
+        self.mask = sprite_mask(self.image, img_name, (40, 70), 180)
+        self.reset()
+        self.add(groups)
+
+    def reset(self):
+        x_pos = rng.randint(50, SCREEN_WIDTH - 50)
         self.rect = self.image.get_rect(midbottom=(x_pos, 0))
         
-        self.speed = random.uniform(3, 5)
+        self.speed = rng.uniform(3, 5)
         self.health = 3
-        
-    def update(self):
-        self.rect.y += self.speed
-        if self.rect.top > SCREEN_HEIGHT:
-            self.kill()
+        self.velocity = (0, self.speed)
+
+class PowerUp(EntitySprite):
+    entity_type = 'powerup'
 
-class PowerUp(pygame.sprite.Sprite):
     def __init__(self, pos, groups, power_type='health'):
-        super().__init__(groups)
+        super().__init__()
         self.power_type = power_type
         
         # Map power types to sprites and colors
@@ -334,30 +345,29 @@ class PowerUp(pygame.sprite.Sprite):
         }
         
         img_name, self.color = power_configs.get(power_type, ('parts_spaceparts_066_png', (255, 255, 255)))
-        self.original_image = asset_manager.get_image(img_name)
+        self.image = asset_manager.get_transformed(img_name, (35, 35))
         
-        if not self.original_image:
-            self.original_image = pygame.Surface((30, 30))
-            self.original_image.fill(self.color)
-        
-        self.image = pygame.transform.scale(self.original_image, (35, 35))
+        if not self.image:
+            self.image = pygame.Surface((35, 35))
+            self.image.fill(self.color)
+        self.mask = sprite_mask(self.image, img_name, (35, 35))
         self.rect = self.image.get_rect(center=pos)
         
         self.speed = 2
-        self.float_offset = 0
         self.float_speed = 3
+        self.health = 1
+        self.velocity = (0, self.speed)
         
-    def update(self):
-        self.rect.y += self.speed
-        self.float_offset += self.float_speed * 0.1
-        self.rect.x += math.sin(self.float_offset) * 2
-        
-        if self.rect.top > SCREEN_HEIGHT:
-            self.kill()
+        # Floats side to side
+        self.sway_rate = self.float_speed * 0.1
+        self.sway = 2
+        self.add(groups)
+
+class PowerDown(EntitySprite):
+    entity_type = 'powerdown'
 
-class PowerDown(pygame.sprite.Sprite):
     def __init__(self, pos, groups, debuff_type='slow'):
-        super().__init__(groups)
+        super().__init__()
         self.debuff_type = debuff_type
         
         debuff_configs = {
@@ -367,26 +377,20 @@ class PowerDown(pygame.sprite.Sprite):
         }
         
         img_name, self.color = debuff_configs.get(debuff_type, ('parts_spaceparts_088_png', (150, 50, 50)))
-        self.original_image = asset_manager.get_image(img_name)
-        
-        if not self.original_image:
-            self.original_image = pygame.Surface((30, 30))
-            self.original_image.fill(self.color)
+        self.image = asset_manager.get_transformed(img_name, (35, 35))
         
-        self.image = pygame.transform.scale(self.original_image, (35, 35))
+        if not self.image:
+            self.image = pygame.Surface((35, 35))
+            self.image.fill(self.color)
+        self.mask = sprite_mask(self.image, img_name, (35, 35))
         self.rect = self.image.get_rect(center=pos)
         
         self.speed = 2.5
-        self.pulse = 0
-        
-    def update(self):
-        self.rect.y += self.speed
-        self.pulse += 0.2
-        
-        if self.rect.top > SCREEN_HEIGHT:
-            self.kill()
+        self.health = 1
+        self.velocity = (0, self.speed)
+        self.add(groups)
 
-class Explosion(pygame.sprite.Sprite):
+class Explosion(PooledSprite):
     def __init__(self, pos, groups):
         super().__init__(groups)
         self.image = asset_manager.get_image('effects_spaceeffects_010_png')
@@ -394,10 +398,13 @@ class Explosion(pygame.sprite.Sprite):
              self.image = pygame.Surface((20, 20))
              self.image.fill(WHITE)
         
-        self.rect = self.image.get_rect(center=pos)
-        self.timer = pygame.time.get_ticks()
         self.duration = 200
+        self.reset(pos)
+
+    def reset(self, pos):
+        self.rect = self.image.get_rect(center=pos)
+        self.timer = game_clock.get_ticks()
 
-    def update(self):
-        if pygame.time.get_ticks() - self.timer > self.duration:
+    def update(self, dt=SIM_DT):
+        if game_clock.get_ticks() - self.timer > self.duration:
             self.kill()
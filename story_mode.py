@@ -1,7 +1,8 @@
 
-import pygame
 from dataclasses import dataclass
 from typing import List, Dict, Callable
+from game_clock import game_clock
+from settings import STORY_METEOR_INTERVAL
 
 @dataclass
 class Challenge:
@@ -19,6 +20,13 @@ class Wave:
     spawn_interval: int  # milliseconds
     meteor_count: int = 0
     
+@dataclass
+class SpawnRule:
+    """A repeating spawn on the simulation timeline"""
+    kind: str  # 'enemy', 'meteor', 'powerup', 'powerdown'
+    interval: int  # milliseconds
+    count: int = 0  # spawns before the rule ends; 0 repeats until replaced
+
 @dataclass
 class StoryData:
     """Complete story configuration"""
@@ -130,8 +138,8 @@ class StoryMode:
         self.story_complete = False
         self.narrative_index = 0
         self.show_narrative = True
-        self.narrative_timer = pygame.time.get_ticks()
-        self.pause_start_time = pygame.time.get_ticks()
+        self.narrative_timer = game_clock.get_ticks()
+        self.pause_start_time = game_clock.get_ticks()
         self.total_pause_time = 0
         
         # Initialize challenge status
@@ -158,6 +166,20 @@ class StoryMode:
         if self.current_wave_index >= len(self.current_story.waves):
             self.complete_story()
     
+    def compile_story(self, story: StoryData) -> List[SpawnRule]:
+        """Spawn rules that run for the whole story"""
+        return [
+            SpawnRule('powerup', story.power_up_spawn_rate),
+            SpawnRule('powerdown', story.power_down_spawn_rate),
+        ]
+    
+    def compile_wave(self, wave: Wave) -> List[SpawnRule]:
+        """Spawn rules for one wave; replace the previous wave's rules"""
+        return [
+            SpawnRule('enemy', wave.spawn_interval, wave.enemy_count),
+            SpawnRule('meteor', STORY_METEOR_INTERVAL if wave.meteor_count > 0 else 0),
+        ]
+    
     def complete_story(self):
         """Mark story as complete"""
         self.story_complete = True
@@ -191,7 +213,7 @@ class StoryMode:
             self.show_narrative = False
             # Track pause time
             if self.pause_start_time > 0:
-                self.total_pause_time += pygame.time.get_ticks() - self.pause_start_time
+                self.total_pause_time += game_clock.get_ticks() - self.pause_start_time
                 self.pause_start_time = 0
     
     def get_all_stories(self) -> List[StoryData]:
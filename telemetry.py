@@ -0,0 +1,156 @@
+import json
+import os
+import queue
+import threading
+import time
+from settings import *
+
+_STOP = object()
+
+class TelemetryWriter:
+    """Appends records as compact JSON lines from a background thread
+
+    ``record`` never blocks the caller: records go into a bounded queue and
+    are dropped (and counted in ``dropped``) while it is full. The writer
+    thread appends them to ``path`` in batches and rotates the file to
+    ``path.1`` ... ``path.<backups>`` once it grows past ``max_bytes``.
+    """
+    def __init__(self, path, buffer_size=TELEMETRY_BUFFER, max_bytes=TELEMETRY_MAX_BYTES,
+                 backups=TELEMETRY_BACKUPS):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.queue = queue.Queue(buffer_size)
+        self.dropped = 0
+        self.written = 0  # Updated by the writer thread
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.thread = threading.Thread(target=self._run, name='telemetry-writer', daemon=True)
+        self.thread.start()
+
+    def record(self, data):
+        """Queue one record; returns False if it had to be dropped"""
+        try:
+            self.queue.put_nowait(data)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        return True
+
+    def close(self, timeout=1.0):
+        """Flush what is queued and stop the thread, waiting at most ``timeout`` seconds"""
+        try:
+            self.queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return
+        self.thread.join(timeout)
+
+    def _rotate(self):
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{i}"):
+                os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+        if self.backups:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def _run(self):
+        f = None
+        stopping = False
+        try:
+            f = open(self.path, 'a')
+            size = f.tell()
+            while not stopping:
+                # Block for one record, then take whatever else is already queued
+                batch = [self.queue.get()]
+                while True:
+                    try:
+                        batch.append(self.queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if _STOP in batch:
+                    batch = batch[:batch.index(_STOP)]
+                    stopping = True
+
+                for data in batch:
+                    line = json.dumps(data, separators=(',', ':')) + '\n'
+                    f.write(line)
+                    size += len(line)
+                    self.written += 1
+                    if size >= self.max_bytes:
+                        f.close()
+                        self._rotate()
+                        f = open(self.path, 'w')
+                        size = 0
+                f.flush()
+        except OSError as e:
+            print(f"Telemetry stopped: {e}")
+        finally:
+            if f:
+                f.close()
+
+class SessionTelemetry:
+    """Samples frame timing and game statistics into a TelemetryWriter
+
+    Call ``frame`` once per rendered frame. Every ``1 / sample_hz`` seconds
+    of real time it records the mean and worst frame time since the last
+    sample, entity, sprite group and particle counts, collisions per
+    simulation tick and the story wave index. ``entities`` is the hostile
+    and pickup load (the EntityStore); ``visible_sprites`` only holds the
+    player, bullets and explosions.
+    """
+    def __init__(self, writer, sample_hz=TELEMETRY_SAMPLE_HZ, seed=None):
+        self.writer = writer
+        self.interval = 1 / sample_hz
+        self.elapsed = 0.0
+        self.next_sample = 0.0
+        self.frames = 0
+        self.frame_total = 0.0
+        self.frame_max = 0.0
+        self.ticks = 0
+        self.collisions = 0
+        writer.record({'session': time.strftime('%Y-%m-%dT%H:%M:%S'), 'seed': seed,
+                       'sim_rate': SIM_RATE, 'sample_hz': sample_hz})
+
+    def frame(self, frame_time, ticks, game_manager):
+        """Account for one frame of ``frame_time`` seconds that ran ``ticks`` simulation ticks"""
+        self.elapsed += frame_time
+        self.frames += 1
+        self.frame_total += frame_time
+        self.frame_max = max(self.frame_max, frame_time)
+        self.ticks += ticks
+        if self.elapsed < self.next_sample:
+            return
+        self.next_sample = self.elapsed + self.interval
+
+        gm = game_manager
+        collisions = gm.collision_count - self.collisions
+        self.collisions = gm.collision_count
+        self.writer.record({
+            't': round(self.elapsed, 3),
+            'state': gm.game_state,
+            'frame_ms': round(self.frame_total / self.frames * 1000, 3),
+            'frame_max_ms': round(self.frame_max * 1000, 3),
+            'entities': len(gm.entities),
+            'visible_sprites': len(gm.visible_sprites),
+            'obstacle_sprites': len(gm.obstacle_sprites),
+            'player_bullets': len(gm.player_bullets),
+            'enemy_bullets': len(gm.enemy_bullets),
+            'particles': len(gm.ui.particle_system),
+            'collisions_per_tick': round(collisions / self.ticks, 4) if self.ticks else 0.0,
+            'wave': gm.story_mode.current_wave_index if gm.game_mode == 'story' else None,
+            'dropped': self.writer.dropped,
+        })
+        self.frames = 0
+        self.frame_total = 0.0
+        self.frame_max = 0.0
+        self.ticks = 0
+
+    def close(self):
+        self.writer.record({'end': round(self.elapsed, 3), 'dropped': self.writer.dropped})
+        self.writer.close()
+
+def session_path(directory=TELEMETRY_DIR):
+    """Fresh telemetry file name for a session starting now"""
+    return os.path.join(directory, time.strftime('session-%Y%m%d-%H%M%S.jsonl'))
@@ -3,6 +3,13 @@ import pygame
 import math
 from settings import *
 from effects import *
+from game_clock import game_clock
+from dirty_rects import dirty_rects
+from asset_manager import asset_manager
+
+# Offsets of the glow copies drawn behind titles
+MENU_GLOW_OFFSETS = ((4, 4), (-4, 4), (4, -4), (-4, -4), (0, 4), (0, -4), (4, 0), (-4, 0))
+OVERLAY_GLOW_OFFSETS = ((3, 3), (-3, 3), (3, -3), (-3, -3))
 
 class Button:
     """Modern button with hover and click effects"""
@@ -13,7 +20,7 @@ class Button:
         self.width = width
         self.height = height
         self.callback = callback
-        self.font = pygame.font.SysFont('arial', font_size, bold=True)
+        self.font = asset_manager.get_font(font_size, bold=True)
         
         self.hovered = False
         self.pressed = False
@@ -64,31 +71,45 @@ class Button:
             pygame.draw.rect(glow_surf, (*UI_PRIMARY, 50), glow_surf.get_rect(), border_radius=15)
             surface.blit(glow_surf, glow_rect)
         
-        # Draw button background with gradient effect
-        button_surf = pygame.Surface((scaled_width, scaled_height), pygame.SRCALPHA)
-        
-        # Create gradient
-        for i in range(scaled_height):
-            progress = i / scaled_height
-            color = color_lerp(UI_SECONDARY, UI_PRIMARY, progress)
-            pygame.draw.line(button_surf, color, (0, i), (scaled_width, i))
+        # Draw button background with cached gradient
+        surface.blit(get_gradient((scaled_width, scaled_height), UI_SECONDARY, UI_PRIMARY), scaled_rect)
         
         # Draw border
-        pygame.draw.rect(button_surf, UI_PRIMARY, button_surf.get_rect(), 3, border_radius=10)
-        
-        surface.blit(button_surf, scaled_rect)
+        pygame.draw.rect(surface, UI_PRIMARY, scaled_rect, 3, border_radius=10)
         
         # Draw text
-        text_surf = self.font.render(self.text, True, UI_TEXT)
+        text_surf = asset_manager.render_text(self.font, self.text, UI_TEXT)
         text_rect = text_surf.get_rect(center=(self.x, self.y))
         surface.blit(text_surf, text_rect)
+        
+        # Hover scaling and glow can change every frame
+        dirty_rects.add(scaled_rect.inflate(20, 20))
+
+def draw_loading_screen(surface, progress):
+    """Title and progress bar shown while assets load; needs no images"""
+    width, height = surface.get_size()
+    surface.fill(UI_BG_DARK)
+    title_surf = asset_manager.render_text(asset_manager.get_font(70, bold=True), "SPACE SHOOTER", UI_TEXT)
+    surface.blit(title_surf, title_surf.get_rect(center=(width // 2, height // 3)))
+
+    bar = pygame.Rect(0, 0, width // 2, 24)
+    bar.center = (width // 2, height // 2)
+    fill = bar.inflate(-8, -8)
+    fill.width = int(fill.width * progress)
+    if fill.width > 0:
+        surface.blit(get_gradient(fill.size, UI_SECONDARY, UI_PRIMARY, vertical=False), fill)
+    pygame.draw.rect(surface, UI_PRIMARY, bar, 2, border_radius=6)
+
+    label = asset_manager.render_text(asset_manager.get_font(30), f"Loading... {int(progress * 100)}%", UI_TEXT_DIM)
+    surface.blit(label, label.get_rect(center=(width // 2, bar.bottom + 30)))
+    dirty_rects.invalidate()
 
 class UI:
     def __init__(self, surface):
         self.display_surface = surface
-        self.font = pygame.font.SysFont('arial', 30)
-        self.menu_font = pygame.font.SysFont('arial', 70, bold=True)
-        self.title_font = pygame.font.SysFont('arial', 90, bold=True)
+        self.font = asset_manager.get_font(30)
+        self.menu_font = asset_manager.get_font(70, bold=True)
+        self.title_font = asset_manager.get_font(90, bold=True)
         
         # Visual effects
         self.particle_system = ParticleSystem()
@@ -112,6 +133,10 @@ class UI:
         # Health bar animation
         self.health_display = 100
         self.health_target = 100
+        
+        # Pre-composited static screen layers and glow surfaces
+        self.static_layers = {}
+        self.glow_cache = {}
 
     def create_menu_buttons(self, callbacks):
         """Create menu buttons with callbacks"""
@@ -223,27 +248,15 @@ class UI:
         self.screen_shake.add_trauma(intensity)
 
     def show_text(self, text, pos, font, color=WHITE, center=False):
-        text_surf = font.render(text, True, color)
+        text_surf = asset_manager.render_text(font, text, color)
         text_rect = text_surf.get_rect(topleft=pos)
         if center:
             text_rect.center = pos
-        self.display_surface.blit(text_surf, text_rect)
+        return self.display_surface.blit(text_surf, text_rect)
 
     def draw_gradient_rect(self, rect, color1, color2, vertical=True):
         """Draw a rectangle with gradient"""
-        surf = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-        
-        if vertical:
-            for i in range(rect.height):
-                progress = i / rect.height
-                color = color_lerp(color1, color2, progress)
-                pygame.draw.line(surf, color, (0, i), (rect.width, i))
-        else:
-            for i in range(rect.width):
-                progress = i / rect.width
-                color = color_lerp(color1, color2, progress)
-                pygame.draw.line(surf, (*color, 255), (i, 0), (i, rect.height))
-        
+        surf = get_gradient(rect.size, color1, color2, vertical)
         self.display_surface.blit(surf, rect.topleft)
 
     def display_hud(self, player):
@@ -282,17 +295,18 @@ class UI:
         # Border
         pygame.draw.rect(self.display_surface, UI_PRIMARY, bg_rect, 3, border_radius=5)
         
-        # Health text
+        # Health text; its glyphs can run past the bottom of the bar
         health_text = f"HP: {int(self.health_display)}"
-        self.show_text(health_text, (bar_x + 10, bar_y + 5), self.font, UI_TEXT)
+        text_rect = self.show_text(health_text, (bar_x + 10, bar_y + 5), self.font, UI_TEXT)
+        dirty_rects.add(bg_rect.union(text_rect))
         
         # Score with glow effect
         score_text = f"SCORE: {int(self.score_display)}"
-        score_surf = self.font.render(score_text, True, UI_ACCENT)
+        score_surf = asset_manager.render_text(self.font, score_text, UI_ACCENT)
         score_rect = score_surf.get_rect(topright=(SCREEN_WIDTH - 20, 20))
         
         # Glow
-        glow_surf = self.font.render(score_text, True, (*UI_ACCENT, 100))
+        glow_surf = asset_manager.render_text(self.font, score_text, (*UI_ACCENT, 100))
         for offset in [(2, 2), (-2, 2), (2, -2), (-2, -2)]:
             glow_rect = score_rect.copy()
             glow_rect.x += offset[0]
@@ -300,11 +314,64 @@ class UI:
             self.display_surface.blit(glow_surf, glow_rect)
         
         self.display_surface.blit(score_surf, score_rect)
+        dirty_rects.add(score_rect.inflate(4, 4))
         
         # Draw text popups
         for popup in self.text_popups:
             popup.draw(self.display_surface)
 
+    def get_static_layer(self, build, key=(), *args):
+        """Pre-composited layer for the parts of a screen that never change.
+
+        ``build(layer, *args)`` draws onto a transparent screen-sized surface
+        once per ``key`` and resolution; the result is cropped to its visible
+        area. Returns ``(surface, topleft)``.
+        """
+        size = self.display_surface.get_size()
+        cache_key = (build.__name__, size, key)
+        layer = self.static_layers.get(cache_key)
+        if layer is None:
+            surf = pygame.Surface(size, pygame.SRCALPHA)
+            build(surf, *args)
+            bounds = surf.get_bounding_rect()
+            layer = (surf.subsurface(bounds).copy(), bounds.topleft)
+            self.static_layers[cache_key] = layer
+        return layer
+
+    def blit_static_layer(self, build, key=(), *args):
+        surf, pos = self.get_static_layer(build, key, *args)
+        self.display_surface.blit(surf, pos)
+
+    def get_glow(self, font, text, color, offsets):
+        """Text rendered at several offsets into one surface, cached.
+
+        Returns ``(surface, offset)`` where offset is how far the surface's
+        topleft sits above/left of the un-offset text position.
+        """
+        key = (font, text, color, offsets)
+        glow = self.glow_cache.get(key)
+        if glow is None:
+            text_surf = asset_manager.render_text(font, text, color)
+            pad = max(max(abs(dx), abs(dy)) for dx, dy in offsets)
+            surf = pygame.Surface((text_surf.get_width() + pad * 2, text_surf.get_height() + pad * 2), pygame.SRCALPHA)
+            for dx, dy in offsets:
+                surf.blit(text_surf, (pad + dx, pad + dy))
+            glow = (surf, pad)
+            self.glow_cache[key] = glow
+        return glow
+
+    def draw_glow_title(self, surface, font, text, color, glow_color, center, offsets):
+        """Title text over its offset glow copies"""
+        glow_surf, pad = self.get_glow(font, text, glow_color, offsets)
+        title_surf = asset_manager.render_text(font, text, color)
+        title_rect = title_surf.get_rect(center=center)
+        surface.blit(glow_surf, (title_rect.x - pad, title_rect.y - pad))
+        surface.blit(title_surf, title_rect)
+
+    def _build_menu_layer(self, layer):
+        title_surf = asset_manager.render_text(self.title_font, "SPACE SHOOTER", UI_TEXT)
+        layer.blit(title_surf, title_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 4)))
+
     def show_menu(self):
         """Enhanced menu with animations"""
         # Draw starfield
@@ -314,124 +381,96 @@ class UI:
         pulse = math.sin(self.title_pulse * math.pi) * 0.1 + 1.0
         title_text = "SPACE SHOOTER"
         
-        # Draw title glow
-        glow_font = pygame.font.SysFont('arial', int(90 * pulse), bold=True)
-        glow_surf = glow_font.render(title_text, True, (*UI_PRIMARY, 150))
+        # Draw title glow (one pre-composited surface per pulse size)
+        glow_font = asset_manager.get_font(int(90 * pulse), bold=True)
+        glow_surf, pad = self.get_glow(glow_font, title_text, (*UI_PRIMARY, 150), MENU_GLOW_OFFSETS)
         glow_rect = glow_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 4))
-        
-        for offset in [(4, 4), (-4, 4), (4, -4), (-4, -4), (0, 4), (0, -4), (4, 0), (-4, 0)]:
-            offset_rect = glow_rect.copy()
-            offset_rect.x += offset[0]
-            offset_rect.y += offset[1]
-            self.display_surface.blit(glow_surf, offset_rect)
+        self.display_surface.blit(glow_surf, glow_rect)
+        dirty_rects.add(glow_rect)
         
         # Draw title
-        title_surf = self.title_font.render(title_text, True, UI_TEXT)
-        title_rect = title_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 4))
-        self.display_surface.blit(title_surf, title_rect)
+        self.blit_static_layer(self._build_menu_layer)
         
         # Draw buttons
         for button in self.menu_buttons:
             button.draw(self.display_surface)
 
+    def _build_overlay_layer(self, layer):
+        # Semi-transparent overlay
+        layer.fill((0, 0, 0, 150))
+
+    def _build_game_over_layer(self, layer):
+        # Game Over title with glow
+        self.draw_glow_title(layer, self.title_font, "GAME OVER", UI_DANGER, (*UI_DANGER, 100),
+                             (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 4), OVERLAY_GLOW_OFFSETS)
+
     def show_game_over(self, score, stats=None):
         """Enhanced game over screen"""
-        # Draw starfield
-        self.particle_system.draw(self.display_surface)
-        
-        # Semi-transparent overlay
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 150))
-        self.display_surface.blit(overlay, (0, 0))
-        
-        # Game Over title
-        game_over_surf = self.title_font.render("GAME OVER", True, UI_DANGER)
-        game_over_rect = game_over_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 4))
-        
-        # Glow effect
-        glow_surf = self.title_font.render("GAME OVER", True, (*UI_DANGER, 100))
-        for offset in [(3, 3), (-3, 3), (3, -3), (-3, -3)]:
-            glow_rect = game_over_rect.copy()
-            glow_rect.x += offset[0]
-            glow_rect.y += offset[1]
-            self.display_surface.blit(glow_surf, glow_rect)
-        
-        self.display_surface.blit(game_over_surf, game_over_rect)
+        # The star field and final game state underneath are drawn by GameManager
+        # Overlay and title
+        self.blit_static_layer(self._build_overlay_layer)
+        self.blit_static_layer(self._build_game_over_layer)
         
         # Final Score
         score_text = f"FINAL SCORE: {int(self.score_display)}"
-        score_surf = self.menu_font.render(score_text, True, UI_ACCENT)
+        score_surf = asset_manager.render_text(self.menu_font, score_text, UI_ACCENT)
         score_rect = score_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50))
-        self.display_surface.blit(score_surf, score_rect)
+        dirty_rects.add(self.display_surface.blit(score_surf, score_rect))
         
         # Draw buttons
         for button in self.game_over_buttons:
             button.draw(self.display_surface)
     
-    def show_story_select(self, stories):
-        """Display story selection screen"""
-        # Draw starfield
-        self.particle_system.draw(self.display_surface)
-        
+    def _build_story_select_layer(self, layer, stories):
         # Title
-        title_text = "SELECT YOUR MISSION"
-        title_surf = self.title_font.render(title_text, True, UI_PRIMARY)
-        title_rect = title_surf.get_rect(center=(SCREEN_WIDTH // 2, 100))
-        self.display_surface.blit(title_surf, title_rect)
+        title_surf = asset_manager.render_text(self.title_font, "SELECT YOUR MISSION", UI_PRIMARY)
+        layer.blit(title_surf, title_surf.get_rect(center=(SCREEN_WIDTH // 2, 100)))
         
-        # Draw story buttons
-        for button in self.story_buttons:
-            button.draw(self.display_surface)
-        
-        # Draw story descriptions
+        # Story descriptions
         start_y = SCREEN_HEIGHT // 2 - 100
         for i, story in enumerate(stories):
             desc_y = start_y + (i * 100) + 45
-            desc_text = story.subtitle
-            desc_surf = pygame.font.SysFont('arial', 20).render(desc_text, True, UI_TEXT_DIM)
-            desc_rect = desc_surf.get_rect(center=(SCREEN_WIDTH // 2, desc_y))
-            self.display_surface.blit(desc_surf, desc_rect)
+            desc_surf = asset_manager.render_text(asset_manager.get_font(20), story.subtitle, UI_TEXT_DIM)
+            layer.blit(desc_surf, desc_surf.get_rect(center=(SCREEN_WIDTH // 2, desc_y)))
     
-    def show_story_complete(self, story, score):
-        """Display story completion screen"""
+    def show_story_select(self, stories):
+        """Display story selection screen"""
         # Draw starfield
         self.particle_system.draw(self.display_surface)
         
-        # Semi-transparent overlay
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 150))
-        self.display_surface.blit(overlay, (0, 0))
-        
-        # Mission Complete title
-        complete_surf = self.title_font.render("MISSION COMPLETE!", True, UI_SUCCESS)
-        complete_rect = complete_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 4))
-        
-        # Glow effect
-        glow_surf = self.title_font.render("MISSION COMPLETE!", True, (*UI_SUCCESS, 100))
-        for offset in [(3, 3), (-3, 3), (3, -3), (-3, -3)]:
-            glow_rect = complete_rect.copy()
-            glow_rect.x += offset[0]
-            glow_rect.y += offset[1]
-            self.display_surface.blit(glow_surf, glow_rect)
+        # Draw story buttons
+        for button in self.story_buttons:
+            button.draw(self.display_surface)
         
-        self.display_surface.blit(complete_surf, complete_rect)
+        # Title and story descriptions
+        self.blit_static_layer(self._build_story_select_layer, tuple(story.id for story in stories), stories)
+    
+    def _build_story_complete_layer(self, layer, story):
+        # Mission Complete title with glow
+        self.draw_glow_title(layer, self.title_font, "MISSION COMPLETE!", UI_SUCCESS, (*UI_SUCCESS, 100),
+                             (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 4), OVERLAY_GLOW_OFFSETS)
         
         # Story title
-        story_surf = self.menu_font.render(story.title, True, UI_PRIMARY)
-        story_rect = story_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 80))
-        self.display_surface.blit(story_surf, story_rect)
+        story_surf = asset_manager.render_text(self.menu_font, story.title, UI_PRIMARY)
+        layer.blit(story_surf, story_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 80)))
+        
+        # Bonus
+        bonus_text = f"COMPLETION BONUS: +{story.completion_reward}"
+        bonus_surf = asset_manager.render_text(self.font, bonus_text, UI_SUCCESS)
+        layer.blit(bonus_surf, bonus_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50)))
+    
+    def show_story_complete(self, story, score):
+        """Display story completion screen"""
+        # The star field and final game state underneath are drawn by GameManager
+        # Overlay, titles and bonus
+        self.blit_static_layer(self._build_overlay_layer)
+        self.blit_static_layer(self._build_story_complete_layer, story.id, story)
         
         # Final Score
         score_text = f"FINAL SCORE: {int(self.score_display)}"
-        score_surf = self.menu_font.render(score_text, True, UI_ACCENT)
+        score_surf = asset_manager.render_text(self.menu_font, score_text, UI_ACCENT)
         score_rect = score_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
-        self.display_surface.blit(score_surf, score_rect)
-        
-        # Bonus
-        bonus_text = f"COMPLETION BONUS: +{story.completion_reward}"
-        bonus_surf = self.font.render(bonus_text, True, UI_SUCCESS)
-        bonus_rect = bonus_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50))
-        self.display_surface.blit(bonus_surf, bonus_rect)
+        dirty_rects.add(self.display_surface.blit(score_surf, score_rect))
         
         # Draw buttons
         for button in self.game_over_buttons:
@@ -450,9 +489,9 @@ class UI:
             wave_num = story_mode.current_wave_index + 1
             total_waves = len(story.waves)
             wave_text = f"WAVE {wave_num}/{total_waves}"
-            wave_surf = self.font.render(wave_text, True, UI_PRIMARY)
+            wave_surf = asset_manager.render_text(self.font, wave_text, UI_PRIMARY)
             wave_rect = wave_surf.get_rect(center=(SCREEN_WIDTH // 2, 20))
-            self.display_surface.blit(wave_surf, wave_rect)
+            dirty_rects.add(self.display_surface.blit(wave_surf, wave_rect))
             
             # Challenges display
             y_offset = 60
@@ -465,7 +504,7 @@ class UI:
                         color = UI_DANGER if player.bullets_remaining < 10 else UI_TEXT
                     elif challenge.type == 'time_limit':
                         # Account for pause time from narrative
-                        elapsed = (pygame.time.get_ticks() - story_mode.story_start_time - story_mode.total_pause_time) // 1000
+                        elapsed = (game_clock.get_ticks() - story_mode.story_start_time - story_mode.total_pause_time) // 1000
                         remaining = max(0, challenge.value - elapsed)
                         text = f"TIME: {remaining}s"
                         color = UI_DANGER if remaining < 30 else UI_TEXT
@@ -475,26 +514,26 @@ class UI:
                     else:
                         continue
                     
-                    challenge_surf = pygame.font.SysFont('arial', 24).render(text, True, color)
+                    challenge_surf = asset_manager.render_text(asset_manager.get_font(24), text, color)
                     challenge_rect = challenge_surf.get_rect(topleft=(20, y_offset))
-                    self.display_surface.blit(challenge_surf, challenge_rect)
+                    dirty_rects.add(self.display_surface.blit(challenge_surf, challenge_rect))
                     y_offset += 30
             
             # Power-up status indicators
             status_y = SCREEN_HEIGHT - 100
             if player.invincible:
-                inv_surf = pygame.font.SysFont('arial', 20, bold=True).render("INVINCIBLE", True, (255, 215, 0))
-                self.display_surface.blit(inv_surf, (SCREEN_WIDTH - 150, status_y))
+                inv_surf = asset_manager.render_text(asset_manager.get_font(20, bold=True), "INVINCIBLE", (255, 215, 0))
+                dirty_rects.add(self.display_surface.blit(inv_surf, (SCREEN_WIDTH - 150, status_y)))
                 status_y += 25
             
             if player.shield_active:
-                shield_surf = pygame.font.SysFont('arial', 20, bold=True).render("SHIELD", True, (150, 150, 255))
-                self.display_surface.blit(shield_surf, (SCREEN_WIDTH - 150, status_y))
+                shield_surf = asset_manager.render_text(asset_manager.get_font(20, bold=True), "SHIELD", (150, 150, 255))
+                dirty_rects.add(self.display_surface.blit(shield_surf, (SCREEN_WIDTH - 150, status_y)))
                 status_y += 25
             
             if player.reverse_controls:
-                rev_surf = pygame.font.SysFont('arial', 20, bold=True).render("REVERSED!", True, (255, 50, 50))
-                self.display_surface.blit(rev_surf, (SCREEN_WIDTH - 150, status_y))
+                rev_surf = asset_manager.render_text(asset_manager.get_font(20, bold=True), "REVERSED!", (255, 50, 50))
+                dirty_rects.add(self.display_surface.blit(rev_surf, (SCREEN_WIDTH - 150, status_y)))
     
     def display_narrative(self, narrative_text):
         """Display story narrative text"""
@@ -519,12 +558,12 @@ class UI:
         start_y = box_y + 50
         
         for i, line in enumerate(narrative_text):
-            line_surf = self.font.render(line, True, UI_TEXT)
+            line_surf = asset_manager.render_text(self.font, line, UI_TEXT)
             line_rect = line_surf.get_rect(center=(SCREEN_WIDTH // 2, start_y + i * line_height))
             self.display_surface.blit(line_surf, line_rect)
         
         # Continue prompt
         prompt_text = "Press SPACE to continue..."
-        prompt_surf = pygame.font.SysFont('arial', 24).render(prompt_text, True, UI_TEXT_DIM)
+        prompt_surf = asset_manager.render_text(asset_manager.get_font(24), prompt_text, UI_TEXT_DIM)
         prompt_rect = prompt_surf.get_rect(center=(SCREEN_WIDTH // 2, box_y + box_height - 40))
         self.display_surface.blit(prompt_surf, prompt_rect)
@@ -1,7 +1,12 @@
 import pygame
 import os
 import sys
-from settings import BG_MUSIC_PATH, COLLISION_SOUND_PATH
+import time
+from settings import BG_MUSIC_PATH, COLLISION_SOUND_PATH, AUDIO_FREQUENCY, AUDIO_BUFFER
+from audio_manager import AudioManager
+
+LATENCY_BUFFERS = (256, 512, 1024, 2048, 4096)
+LATENCY_PLAYS = 20
 
 def verify_audio():
     print(f"Checking audio file at: {BG_MUSIC_PATH}")
@@ -37,5 +42,47 @@ def verify_audio():
     except Exception as e:
         print(f"FAIL: Error during audio verification: {e}")
 
+def measure_latency(buffers=LATENCY_BUFFERS, plays=LATENCY_PLAYS):
+    """Time sound loading and playback through AudioManager at several mixer buffer sizes
+
+    The buffer latency is the length of one mixer buffer, the floor on how
+    long a sound takes to reach the output; actual output latency adds the
+    driver's own buffering on top. "play call" is only the CPU cost of
+    ``AudioManager.play`` on the game thread.
+    """
+    print(f"\nPlay latency of {os.path.basename(COLLISION_SOUND_PATH)} (default buffer {AUDIO_BUFFER}):")
+    print(f"{'buffer':>8} {'buffer ms':>10} {'load ms':>10} {'cached ms':>10} {'play call us':>13}")
+    for buffer in buffers:
+        pygame.mixer.quit()
+        audio = AudioManager()
+        if not audio.init(AUDIO_FREQUENCY, buffer):
+            return
+        frequency = pygame.mixer.get_init()[0]
+
+        # First load decodes the MP3 unless an earlier run cached it; the
+        # second goes through the cache for certain
+        start = time.perf_counter()
+        sound = audio.load('collision', COLLISION_SOUND_PATH, max_voices=1, retrigger_ms=0)
+        decode = time.perf_counter() - start
+        if sound is None:
+            return
+        audio.sounds.clear()
+        start = time.perf_counter()
+        audio.load('collision', COLLISION_SOUND_PATH, max_voices=1, retrigger_ms=0)
+        cached = time.perf_counter() - start
+
+        play_times = []
+        for _ in range(plays):
+            audio.stop_all()
+            start = time.perf_counter()
+            audio.play('collision')
+            play_times.append(time.perf_counter() - start)
+
+        play_us = sum(play_times) / len(play_times) * 1e6
+        print(f"{buffer:>8} {buffer / frequency * 1000:>10.1f} {decode * 1000:>10.1f} {cached * 1000:>10.1f} "
+              f"{play_us:>13.1f}")
+    pygame.mixer.quit()
+
 if __name__ == "__main__":
     verify_audio()
+    measure_latency()